@@ -4,10 +4,26 @@ Based on the Fly.io article pattern: https://fly.io/blog/everyone-write-an-agent
 """
 
 import json
-from typing import List, Dict, Any, Callable, Optional
-from anthropic import Anthropic
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from hashlib import sha256
+from typing import List, Dict, Any, Callable, Optional, Union
+from bond.cache import LLMCache
 from bond.config import load_config
 
+# Tool arguments naming a file whose mtime must be part of a memoization key
+FILE_ARGUMENTS = ('filepath',)
+
+# Tool results kept verbatim in the context; older tool_use/tool_result pairs
+# are replaced by a short marker before the context is sent to the LLM
+MAX_TOOL_ROUND_HISTORY = 4
+
+# Returned by process() when the LLM produced no text
+NO_RESPONSE = "No response generated"
+
+# Upper bound on tool calls from a single response executed concurrently
+MAX_TOOL_WORKERS = 8
+
 
 class BondAgent:
     """
@@ -19,21 +35,55 @@ class BondAgent:
     - Loop: call LLM → handle tool calls → repeat
     """
 
-    def __init__(self):
-        """Initialize the agent with configuration and empty context."""
+    def __init__(self, cache_enabled: bool = True, stream: bool = True, cache_backend: Any = None):
+        """
+        Initialize the agent with configuration and empty context.
+
+        Args:
+            cache_enabled: Whether to reuse responses for identical requests
+            cache_backend: Storage for the response cache (defaults to in-memory)
+            stream: Whether to stream responses, forwarding text deltas to on_text
+        """
+        # Deferred: importing anthropic is the bulk of startup time
+        from anthropic import Anthropic
+
         self.config = load_config()
         self.client = Anthropic(
             api_key=self.config['auth_token'],
             base_url=self.config['base_url']
         )
         self.context: List[Dict[str, Any]] = []
+        # Anthropic-format mirror of self.context[:self._converted_upto]
+        self._anthropic_context: List[Dict[str, Any]] = []
+        self._converted_upto = 0
         self.tools: Dict[str, Dict[str, Any]] = {}
         self.tool_functions: Dict[str, Callable] = {}
+        # Snapshots rebuilt on registration so call() doesn't re-derive them per turn
+        self._tools_list_cache: List[Dict[str, Any]] = []
+        self._tools_digest: Optional[str] = None
+        self.cache_enabled = cache_enabled
+        self.stream = stream
+        # Receives text deltas as they arrive when streaming (e.g. the CLI's stdout writer)
+        self.on_text: Optional[Callable[[str], None]] = None
+        self.response_cache = LLMCache(backend=cache_backend)
+        self.deterministic_tools: set[str] = set()
+        self.serial_tools: set[str] = set()
+        # Per-call parallel_safe predicates, consulted before serial_tools
+        self._parallel_checks: Dict[str, Callable[[Dict[str, Any]], bool]] = {}
+        # Tools whose side effects make a cached response unsafe to replay
+        self.side_effect_tools: set[str] = set()
+        # Shared by concurrent tool batches and speculative prefetch while streaming
+        self._tool_executor = ThreadPoolExecutor(max_workers=MAX_TOOL_WORKERS)
+        self._prefetched: Dict[str, Future] = {}
+        self._tool_cache = LLMCache(max_size=512, ttl=None)
         
         # Add workspace management system prompt to guide the LLM
         self._add_workspace_prompt()
 
-    def add_tool(self, name: str, description: str, parameters: Dict[str, Any], function: Callable):
+    def add_tool(self, name: str, description: str, parameters: Dict[str, Any], function: Callable,
+                 deterministic: bool = False,
+                 parallel_safe: Union[bool, Callable[[Dict[str, Any]], bool]] = True,
+                 side_effects: bool = False):
         """
         Add a tool that the agent can call.
 
@@ -42,6 +92,11 @@ class BondAgent:
             description: Description of what the tool does
             parameters: JSON schema for the tool's parameters
             function: Python function to call when tool is invoked
+            deterministic: Whether results can be memoized for identical arguments
+            parallel_safe: Whether the tool may run concurrently with other tools,
+                or a predicate deciding it per call from the call's arguments
+            side_effects: Whether the tool changes state outside the agent (such
+                tools run serially unless a parallel_safe predicate clears the call)
         """
         # Store tools in Anthropic's native format
         self.tools[name] = {
@@ -50,6 +105,39 @@ class BondAgent:
             'input_schema': parameters,
         }
         self.tool_functions[name] = function
+        self._tools_list_cache = list(self.tools.values())
+        # The tools payload only changes here, so hash it once for cache keys
+        self._tools_digest = sha256(
+            json.dumps(self._tools_list_cache, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        if deterministic:
+            self.deterministic_tools.add(name)
+        else:
+            self.deterministic_tools.discard(name)
+        if callable(parallel_safe):
+            self._parallel_checks[name] = parallel_safe
+            # Calls the predicate doesn't clear run serially
+            parallel_safe = False
+        else:
+            self._parallel_checks.pop(name, None)
+        if parallel_safe and not side_effects:
+            self.serial_tools.discard(name)
+        else:
+            self.serial_tools.add(name)
+        if side_effects:
+            self.side_effect_tools.add(name)
+        else:
+            self.side_effect_tools.discard(name)
+
+    def _runs_serially(self, tool_name: str, arguments: Dict[str, Any]) -> bool:
+        """Whether this call must run alone, in order with the calls around it."""
+        check = self._parallel_checks.get(tool_name)
+        if check is not None:
+            try:
+                return not check(arguments)
+            except Exception:
+                return True
+        return tool_name in self.serial_tools
 
     def _prepare_messages(self) -> List[Dict[str, Any]]:
         """
@@ -60,48 +148,137 @@ class BondAgent:
         # Future: could transform between different message formats
         return self.context
 
-    def _convert_to_anthropic_format(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _convert_one(self, msg: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
-        Convert internal message format to Anthropic API format.
+        Convert a single internal message to Anthropic API format.
+
+        Returns a (possibly empty) list of Anthropic message dicts;
+        messages with no Anthropic equivalent (e.g. system) yield [].
         """
-        anthropic_messages = []
-        for msg in messages:
-            if msg['role'] == 'user':
-                anthropic_messages.append({
-                    'role': 'user',
+        if msg['role'] == 'user':
+            return [{
+                'role': 'user',
+                'content': msg['content']
+            }]
+        elif msg['role'] == 'assistant':
+            if 'tool_calls' in msg:
+                # Handle tool calls - convert to Anthropic format
+                content = []
+                for tool_call in msg['tool_calls']:
+                    # handle_tools stores the parsed input; JSON strings are legacy
+                    tool_input = tool_call['function']['arguments']
+                    if isinstance(tool_input, str):
+                        tool_input = json.loads(tool_input)
+                    content.append({
+                        'type': 'tool_use',
+                        'id': tool_call['id'],
+                        'name': tool_call['function']['name'],
+                        'input': tool_input
+                    })
+                return [{
+                    'role': 'assistant',
+                    'content': content
+                }]
+            return [{
+                'role': 'assistant',
+                'content': msg['content']
+            }]
+        elif msg['role'] == 'tool':
+            # Handle tool results
+            return [{
+                'role': 'user',
+                'content': [{
+                    'type': 'tool_result',
+                    'tool_use_id': msg['tool_call_id'],
                     'content': msg['content']
-                })
-            elif msg['role'] == 'assistant':
+                }]
+            }]
+        return []
+
+    def _compact_context(self):
+        """
+        Elide tool rounds older than the last MAX_TOOL_ROUND_HISTORY results.
+
+        Old tool_use/tool_result pairs are rarely relevant after later
+        reasoning but are re-sent on every call. Each run of them is replaced
+        by a single marker message (merging markers from earlier passes).
+        User and assistant text turns are always kept.
+
+        The cutoff is moved back to the assistant message that issued the
+        oldest kept result, so a round (one tool_calls message and all its
+        results) is either kept whole or elided whole; a tool_use is never
+        left without its tool_result.
+        """
+        tool_indices = [i for i, msg in enumerate(self.context) if msg['role'] == 'tool']
+        if len(tool_indices) <= MAX_TOOL_ROUND_HISTORY:
+            return
+
+        # Index of the assistant message that issued each tool call
+        owner = {
+            tool_call['id']: i
+            for i, msg in enumerate(self.context) if 'tool_calls' in msg
+            for tool_call in msg['tool_calls']
+        }
+        cutoff = tool_indices[-MAX_TOOL_ROUND_HISTORY]
+        while True:
+            start = min(
+                owner.get(self.context[i]['tool_call_id'], i)
+                for i in tool_indices if i >= cutoff
+            )
+            if start == cutoff:
+                break
+            cutoff = start
+
+        compacted = []
+        elided = 0
+        for i, msg in enumerate(self.context):
+            if i < cutoff:
+                if msg['role'] == 'tool':
+                    elided += 1
+                    continue
+                if msg.get('elided'):
+                    elided += msg['elided']
+                    continue
                 if 'tool_calls' in msg:
-                    # Handle tool calls - convert to Anthropic format
-                    content = []
-                    for tool_call in msg['tool_calls']:
-                        content.append({
-                            'type': 'tool_use',
-                            'id': tool_call['id'],
-                            'name': tool_call['function']['name'],
-                            'input': json.loads(tool_call['function']['arguments'])
-                        })
-                    anthropic_messages.append({
-                        'role': 'assistant',
-                        'content': content
-                    })
-                else:
-                    anthropic_messages.append({
-                        'role': 'assistant',
-                        'content': msg['content']
-                    })
-            elif msg['role'] == 'tool':
-                # Handle tool results
-                anthropic_messages.append({
-                    'role': 'user',
-                    'content': [{
-                        'type': 'tool_result',
-                        'tool_use_id': msg['tool_call_id'],
-                        'content': msg['content']
-                    }]
+                    continue
+            if elided:
+                compacted.append({
+                    "role": "user",
+                    "content": f"[{elided} prior tool results elided]",
+                    "elided": elided
                 })
-        return anthropic_messages
+                elided = 0
+            compacted.append(msg)
+
+        if len(compacted) == len(self.context):
+            return
+        # Rewrite in place so callers holding self.context see the same list
+        self.context[:] = compacted
+        self._anthropic_context = []
+        self._converted_upto = 0
+
+    def _convert_to_anthropic_format(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convert internal message format to Anthropic API format.
+
+        The agent's own context is converted incrementally: only messages
+        appended since the previous call are converted, the rest is reused.
+        """
+        if messages is not self.context:
+            anthropic_messages = []
+            for msg in messages:
+                anthropic_messages.extend(self._convert_one(msg))
+            return anthropic_messages
+
+        if self._converted_upto > len(self.context):
+            # Context was truncated behind our back - start over
+            self._anthropic_context = []
+            self._converted_upto = 0
+
+        for msg in self.context[self._converted_upto:]:
+            self._anthropic_context.extend(self._convert_one(msg))
+        self._converted_upto = len(self.context)
+        return self._anthropic_context
 
     def call(self, messages: List[Dict[str, Any]], use_tools: bool = True) -> Any:
         """
@@ -114,7 +291,10 @@ class BondAgent:
         Returns:
             LLM response
         """
-        tools_list = list(self.tools.values()) if self.tools and use_tools else None
+        tools_list = self._tools_list_cache if (self._tools_list_cache and use_tools) else None
+
+        if messages is self.context:
+            self._compact_context()
 
         # Convert context format to Anthropic format
         anthropic_messages = self._convert_to_anthropic_format(messages)
@@ -128,10 +308,100 @@ class BondAgent:
         if tools_list:
             kwargs['tools'] = tools_list
 
-        response = self.client.messages.create(**kwargs)
+        if not self.cache_enabled:
+            return self._create(kwargs)
+
+        key = sha256(json.dumps({
+            'model': kwargs['model'],
+            'messages': anthropic_messages,
+            'tools': self._tools_digest if tools_list else None,
+        }, sort_keys=True, default=str).encode()).hexdigest()
+
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            if self.stream:
+                # Replay the text so streaming callers still see output
+                for block in cached.content:
+                    if block.type == 'text':
+                        self._emit_text(block.text)
+            return cached
+
+        response = self._create(kwargs)
+
+        # Replaying a response that asks for a state-mutating tool would
+        # re-run its side effects against a possibly different world
+        replay_unsafe = any(
+            block.type == 'tool_use' and block.name in self.side_effect_tools
+            for block in response.content
+        )
+        if not replay_unsafe:
+            self.response_cache.set(key, response)
+
+        return response
+
+    def _create(self, kwargs: Dict[str, Any]) -> Any:
+        """
+        Issue the API request, streaming when enabled.
+
+        Either way the fully assembled Message is returned, so tool handling
+        and the response cache don't care which path produced it.
+        """
+        if not self.stream:
+            return self.client.messages.create(**kwargs)
 
+        self._prefetched.clear()
+        prefetching = True
+        try:
+            with self.client.messages.stream(**kwargs) as stream:
+                for event in stream:
+                    if event.type == 'text':
+                        self._emit_text(event.text)
+                    elif event.type == 'content_block_stop' and event.content_block.type == 'tool_use':
+                        # The tool's input is complete: start it while the model keeps
+                        # generating. Only deterministic tools run ahead, so a stream
+                        # that fails later leaves nothing changed; stop at the first
+                        # serial tool so nothing after it runs ahead of it.
+                        block = event.content_block
+                        if self._runs_serially(block.name, block.input):
+                            prefetching = False
+                        if prefetching and block.name in self.deterministic_tools:
+                            self._prefetched[block.id] = self._tool_executor.submit(
+                                self.tool_call, block.name, block.input
+                            )
+                response = stream.get_final_message()
+        except BaseException:
+            # The response is lost; drop the calls started for it
+            for future in self._prefetched.values():
+                future.cancel()
+            self._prefetched.clear()
+            raise
+
+        # Separate text streamed before a tool round from the next turn's text
+        if response.stop_reason == 'tool_use' and any(block.type == 'text' for block in response.content):
+            self._emit_text("\n")
         return response
 
+    def _emit_text(self, text: str):
+        """Forward a streamed text delta to the on_text callback, if any."""
+        if self.on_text is not None:
+            self.on_text(text)
+
+    def _tool_cache_key(self, tool_name: str, arguments: Dict[str, Any]) -> Optional[str]:
+        """
+        Build the memoization key for a deterministic tool call.
+
+        File arguments contribute their mtime so edits invalidate the entry.
+        Returns None when a referenced file can't be stat'ed (don't cache).
+        """
+        mtimes = {}
+        for arg in FILE_ARGUMENTS:
+            if arg in arguments:
+                try:
+                    mtimes[arg] = os.stat(arguments[arg]).st_mtime_ns
+                except (OSError, TypeError, ValueError):
+                    return None
+        return json.dumps([tool_name, arguments, mtimes], sort_keys=True, default=str)
+
     def tool_call(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute a single tool call.
@@ -150,6 +420,17 @@ class BondAgent:
                 "content": f"Error: Tool '{tool_name}' not found"
             }
 
+        cache_key = None
+        if tool_name in self.deterministic_tools:
+            cache_key = self._tool_cache_key(tool_name, arguments)
+            cached = self._tool_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                return {
+                    "role": "tool",
+                    "tool_call_id": "generated",  # Will be overwritten
+                    "content": cached
+                }
+
         try:
             result = self.tool_functions[tool_name](**arguments)
 
@@ -162,6 +443,9 @@ class BondAgent:
                 # For dicts, lists, or other complex types, JSON-encode them
                 content = json.dumps(result)
 
+            if cache_key:
+                self._tool_cache.set(cache_key, content)
+
             return {
                 "role": "tool",
                 "tool_call_id": "generated",  # Will be overwritten
@@ -193,26 +477,40 @@ class BondAgent:
         if not response.content or len(response.content) == 0:
             return False
 
-        # Check if any content blocks are tool_use blocks
-        tool_use_blocks = [block for block in response.content if block.type == 'tool_use']
-        if not tool_use_blocks:
+        # Check if any content blocks are tool_use blocks (stop at the first one)
+        if next((block for block in response.content if block.type == 'tool_use'), None) is None:
             return False
 
-        # Execute each tool call
-        for tool_use in tool_use_blocks:
-            tool_name = tool_use.name
-            arguments = tool_use.input
-
-            # Execute the tool
-            tool_result = self.tool_call(tool_name, arguments)
-
+        tool_uses = [block for block in response.content if block.type == 'tool_use']
+
+        # Tools prefetched while the response streamed are usually done already
+        futures = [self._prefetched.pop(tu.id, None) for tu in tool_uses]
+
+        # Independent tools (often I/O-bound) run concurrently. A serial call
+        # is a barrier: the calls before it finish first, it runs alone, and
+        # the calls after it start once it is done.
+        results: List[Any] = [None] * len(tool_uses)
+        running = []
+        for i, (future, tu) in enumerate(zip(futures, tool_uses)):
+            if len(tool_uses) > 1 and not self._runs_serially(tu.name, tu.input):
+                running.append((i, future or self._tool_executor.submit(self.tool_call, tu.name, tu.input)))
+                continue
+            for j, pending in running:
+                results[j] = pending.result()
+            running = []
+            results[i] = future.result() if future else self.tool_call(tu.name, tu.input)
+        for j, pending in running:
+            results[j] = pending.result()
+
+        # Add calls and results to context in the order the LLM issued them
+        for tool_use, tool_result in zip(tool_uses, results):
             # Convert to our internal format for context
             tool_call_dict = {
                 "id": tool_use.id,
                 "type": "function",
                 "function": {
                     "name": tool_use.name,
-                    "arguments": json.dumps(tool_use.input)
+                    "arguments": tool_use.input
                 }
             }
 
@@ -286,7 +584,7 @@ WORKSPACE MANAGEMENT RULES:
 IMPORTANT: When creating demo applications, tutorials, or example files, you MUST use the workspace system to avoid polluting the Bond project directory:
 
 1. ALWAYS call get_demo_workspace('name') before creating demo files
-2. ALWAYS cd to the workspace directory provided
+2. ALWAYS cd to the workspace directory provided, in the same bash call as the commands that use it (each bash call starts in the project directory)
 3. NEVER create demo files (like app.py, requirements.txt, etc.) in the main project directory
 4. For tests, use get_test_workspace('type')  
 5. For temporary work, use get_temp_workspace()
@@ -295,7 +593,7 @@ Example workflow:
 User: "how to set up a Flask app"
 You: 
 1. Call get_demo_workspace("flask_app") → gets path like /home/will/projects/bond/.workspace/demos/flask_app_20251108_123456
-2. Call bash("cd /path/to/workspace")  
+2. Call bash("cd /path/to/workspace && ...")  
 3. Create demo files in that directory
 4. Tell user: "Demo created in [workspace_path]"
 
@@ -355,18 +653,19 @@ This keeps the Bond project clean and organized!
 
         # Add final response to context
         if response.content and len(response.content) > 0:
-            # Extract text from content blocks (excluding tool_use blocks)
-            text_blocks = [block for block in response.content if block.type == 'text']
-            if text_blocks:
-                final_message = text_blocks[0].text
+            # Extract the first text block (excluding tool_use blocks)
+            final_message = next((block.text for block in response.content if block.type == 'text'), None)
+            if final_message is not None:
                 self.context.append({"role": "assistant", "content": final_message})
                 return final_message
 
-        return "No response generated"
+        return NO_RESPONSE
 
     def reset_context(self):
         """Clear the conversation context."""
         self.context = []
+        self._anthropic_context = []
+        self._converted_upto = 0
 
     def get_context(self) -> List[Dict[str, Any]]:
         """Get the current conversation context."""
@@ -0,0 +1,221 @@
+"""
+Response caching for Bond agent.
+Content-addressed cache used to short-circuit repeated LLM round-trips.
+
+Storage is pluggable: MemoryBackend keeps entries for the lifetime of the
+process, SQLiteBackend persists them so cache hits survive CLI restarts.
+"""
+
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Default location of the persistent response cache
+DEFAULT_CACHE_PATH = Path.home() / ".bond" / "cache.sqlite"
+
+
+class MemoryBackend:
+    """
+    In-memory LRU storage.
+
+    The least recently used entry is evicted once max_size is reached.
+    """
+
+    def __init__(self, max_size: int = 256):
+        """
+        Initialize empty storage.
+
+        Args:
+            max_size: Maximum number of entries to keep
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple[Optional[float], Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the stored value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> int:
+        """
+        Store a value.
+
+        Returns:
+            Number of entries evicted to make room
+        """
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        evicted = 0
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def delete(self, key: str):
+        """Remove an entry if present."""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """
+    SQLite storage for cross-session reuse.
+
+    Values are pickled into a (key, blob, expires_at) table. The connection
+    autocommits, so each write is visible to other sessions straight away
+    and no write lock is held between calls.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Location of the SQLite file (defaults to ~/.bond/cache.sqlite)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Access is serialized by LLMCache's lock, so sharing across threads is safe
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, blob BLOB, expires_at INTEGER)"
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the stored value, or None if missing, expired or unreadable."""
+        row = self.conn.execute(
+            "SELECT blob, expires_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        blob, expires_at = row
+        if expires_at is not None and time.time() >= expires_at:
+            self.delete(key)
+            return None
+
+        try:
+            return pickle.loads(blob)
+        except Exception:
+            # Written by an incompatible SDK version - drop it
+            self.delete(key)
+            return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> int:
+        """
+        Store a value.
+
+        Returns:
+            Number of entries evicted (always 0 - expiry is the only bound)
+        """
+        expires_at = int(time.time() + ttl) if ttl is not None else None
+        self.conn.execute(
+            "INSERT OR REPLACE INTO cache (key, blob, expires_at) VALUES (?, ?, ?)",
+            (key, pickle.dumps(value), expires_at),
+        )
+        return 0
+
+    def delete(self, key: str):
+        """Remove an entry if present."""
+        self.conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self):
+        """Remove all entries."""
+        self.conn.execute("DELETE FROM cache")
+
+    def __len__(self) -> int:
+        (count,) = self.conn.execute(
+            "SELECT COUNT(*) FROM cache WHERE expires_at IS NULL OR expires_at > ?",
+            (time.time(),),
+        ).fetchone()
+        return count
+
+
+class LLMCache:
+    """
+    Cache with optional TTL and hit/miss statistics.
+
+    Entries are keyed by a caller-supplied string (typically a SHA-256 digest
+    of the request payload). Entries older than ttl seconds are treated as
+    misses. Safe to share between the threads that execute tool calls.
+    """
+
+    def __init__(self, max_size: int = 256, ttl: Optional[float] = 3600, backend: Any = None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size: Maximum number of entries to keep (in-memory backend)
+            ttl: Seconds an entry stays valid (None disables expiry)
+            backend: Storage backend (defaults to MemoryBackend(max_size))
+        """
+        self.ttl = ttl
+        self.backend = backend if backend is not None else MemoryBackend(max_size)
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None on miss or expiry
+        """
+        with self._lock:
+            value = self.backend.get(key)
+            if value is None:
+                self.stats["misses"] += 1
+            else:
+                self.stats["hits"] += 1
+            return value
+
+    def set(self, key: str, value: Any):
+        """
+        Store a value, evicting old entries if the backend is full.
+
+        A backend that fails to write (e.g. a locked SQLite file) only costs
+        the cache entry; the error is not passed on to the caller.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        with self._lock:
+            try:
+                self.stats["evictions"] += self.backend.set(key, value, self.ttl)
+            except Exception:
+                pass
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self.backend.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self.backend)
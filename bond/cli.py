@@ -3,20 +3,80 @@ Interactive CLI for Bond agent.
 Provides a command-line interface similar to Claude Code.
 """
 
+from __future__ import annotations
+
+import argparse
 import sys
 import signal
-from bond.agent import BondAgent
-from bond import tools
-
-
-def setup_agent(agent: BondAgent):
-    """Register available tools with the agent."""
-    
+import traceback
+from typing import TYPE_CHECKING, List, Optional
+
+# The agent pulls in anthropic (httpx, pydantic, ...); import it only once
+# run_cli() actually needs it so the CLI can start printing right away
+if TYPE_CHECKING:
+    from bond.agent import BondAgent
+
+
+# curl options that send a body, change the method or write local files; a
+# clustered short flag ("-sXPOST") counts if any of its letters is listed
+_CURL_WRITE_SHORT = set("XdFTPQoOKcD")
+_CURL_WRITE_LONG = (
+    "--request", "--data", "--json", "--form", "--upload-file", "--quote",
+    "--ftp-port", "--output", "--remote-name", "--create-dirs", "--config",
+    "--cookie-jar", "--dump-header", "--etag-save", "--hsts", "--alt-svc",
+    "--trace", "--stderr", "--libcurl",
+)
+
+# gh subcommands that only read; None means every subcommand of the group
+_GH_READ_ONLY = {
+    "repo": {"view", "list"},
+    "issue": {"list", "view", "status"},
+    "pr": {"list", "view", "status", "diff", "checks"},
+    "release": {"list", "view"},
+    "run": {"list", "view"},
+    "workflow": {"list", "view"},
+    "gist": {"list", "view"},
+    "label": {"list"},
+    "auth": {"status"},
+    "search": None,
+    "status": None,
+    "--version": None,
+}
+
+
+def _curl_read_only(arguments: dict) -> bool:
+    """Whether a curl call is a plain fetch, safe to run alongside other tools."""
+    for flag in arguments.get("options", "").split():
+        if flag.startswith("--"):
+            if flag.split("=", 1)[0].startswith(_CURL_WRITE_LONG):
+                return False
+        elif flag.startswith("-") and _CURL_WRITE_SHORT.intersection(flag[1:]):
+            return False
+    return True
+
+
+def _gh_read_only(arguments: dict) -> bool:
+    """Whether a gh call only reads from GitHub (api and browse never count)."""
+    words = arguments.get("command", "").split()
+    if not words or words[0] not in _GH_READ_ONLY or "--web" in words or "-w" in words:
+        return False
+    subcommands = _GH_READ_ONLY[words[0]]
+    return subcommands is None or (len(words) > 1 and words[1] in subcommands)
+
+
+# Tool registry: setup_agent() registers these in order. Each "name" is also the
+# implementation's name in bond.tools (resolved lazily); "category" drives --profile.
+# "side_effects" marks tools that change state outside the agent (files, GitHub,
+# remote servers): a cached response calling one of them is never replayed.
+# Such tools run serially unless "parallel_safe" is a predicate that clears the
+# individual call, as curl and gh do for plain reads.
+TOOL_SPECS = [
     # Basic utility tools
-    agent.add_tool(
-        name="ping",
-        description="Ping some host on the internet to test connectivity",
-        parameters={
+    {
+        "name": "ping",
+        "category": "basic",
+        "description": "Ping some host on the internet to test connectivity",
+        "parameters": {
             "type": "object",
             "properties": {
                 "host": {
@@ -24,26 +84,25 @@ def setup_agent(agent: BondAgent):
                     "description": "hostname or IP address to ping"
                 }
             },
-            "required": ["host"],
+            "required": ["host"]
         },
-        function=tools.ping
-    )
-
-    agent.add_tool(
-        name="get_system_info",
-        description="Get basic system information including platform, Python version, etc.",
-        parameters={
+    },
+    {
+        "name": "get_system_info",
+        "category": "basic",
+        "description": "Get basic system information including platform, Python version, etc.",
+        "parameters": {
             "type": "object",
             "properties": {},
-            "required": [],
+            "required": []
         },
-        function=tools.get_system_info
-    )
-
-    agent.add_tool(
-        name="echo",
-        description="Echo back a message",
-        parameters={
+        "deterministic": True,
+    },
+    {
+        "name": "echo",
+        "category": "basic",
+        "description": "Echo back a message",
+        "parameters": {
             "type": "object",
             "properties": {
                 "message": {
@@ -51,15 +110,15 @@ def setup_agent(agent: BondAgent):
                     "description": "The message to echo"
                 }
             },
-            "required": ["message"],
+            "required": ["message"]
         },
-        function=tools.echo
-    )
-
-    agent.add_tool(
-        name="calculate",
-        description="Perform a basic mathematical calculation",
-        parameters={
+        "deterministic": True,
+    },
+    {
+        "name": "calculate",
+        "category": "basic",
+        "description": "Perform a basic mathematical calculation",
+        "parameters": {
             "type": "object",
             "properties": {
                 "operation": {
@@ -75,16 +134,16 @@ def setup_agent(agent: BondAgent):
                     "description": "Second number"
                 }
             },
-            "required": ["operation", "a", "b"],
+            "required": ["operation", "a", "b"]
         },
-        function=tools.calculate
-    )
-
+        "deterministic": True,
+    },
     # File system tools
-    agent.add_tool(
-        name="ls",
-        description="List directory contents with details",
-        parameters={
+    {
+        "name": "ls",
+        "category": "files",
+        "description": "List directory contents with details",
+        "parameters": {
             "type": "object",
             "properties": {
                 "path": {
@@ -92,26 +151,25 @@ def setup_agent(agent: BondAgent):
                     "description": "Directory path to list (default: current directory)"
                 }
             },
-            "required": [],
+            "required": []
         },
-        function=tools.ls
-    )
-
-    agent.add_tool(
-        name="pwd",
-        description="Print current working directory path",
-        parameters={
+    },
+    {
+        "name": "pwd",
+        "category": "files",
+        "description": "Print current working directory path",
+        "parameters": {
             "type": "object",
             "properties": {},
-            "required": [],
+            "required": []
         },
-        function=tools.pwd
-    )
-
-    agent.add_tool(
-        name="cat",
-        description="Display the contents of a file",
-        parameters={
+        "deterministic": True,
+    },
+    {
+        "name": "cat",
+        "category": "files",
+        "description": "Display the contents of a file",
+        "parameters": {
             "type": "object",
             "properties": {
                 "filepath": {
@@ -119,15 +177,15 @@ def setup_agent(agent: BondAgent):
                     "description": "Path to the file to display"
                 }
             },
-            "required": ["filepath"],
+            "required": ["filepath"]
         },
-        function=tools.cat
-    )
-
-    agent.add_tool(
-        name="grep",
-        description="Search for a pattern in a file",
-        parameters={
+        "deterministic": True,
+    },
+    {
+        "name": "grep",
+        "category": "files",
+        "description": "Search for a pattern in a file",
+        "parameters": {
             "type": "object",
             "properties": {
                 "pattern": {
@@ -139,15 +197,14 @@ def setup_agent(agent: BondAgent):
                     "description": "File to search in"
                 }
             },
-            "required": ["pattern", "filepath"],
+            "required": ["pattern", "filepath"]
         },
-        function=tools.grep
-    )
-
-    agent.add_tool(
-        name="find",
-        description="Find files matching a pattern in a directory",
-        parameters={
+    },
+    {
+        "name": "find",
+        "category": "files",
+        "description": "Find files matching a pattern in a directory",
+        "parameters": {
             "type": "object",
             "properties": {
                 "path": {
@@ -159,15 +216,14 @@ def setup_agent(agent: BondAgent):
                     "description": "Filename pattern to match (e.g., '*.py')"
                 }
             },
-            "required": ["path"],
+            "required": ["path"]
         },
-        function=tools.find
-    )
-
-    agent.add_tool(
-        name="head",
-        description="Display first N lines of a file",
-        parameters={
+    },
+    {
+        "name": "head",
+        "category": "files",
+        "description": "Display first N lines of a file",
+        "parameters": {
             "type": "object",
             "properties": {
                 "filepath": {
@@ -179,15 +235,15 @@ def setup_agent(agent: BondAgent):
                     "description": "Number of lines to show (default: 10)"
                 }
             },
-            "required": ["filepath"],
+            "required": ["filepath"]
         },
-        function=tools.head
-    )
-
-    agent.add_tool(
-        name="tail",
-        description="Display last N lines of a file",
-        parameters={
+        "deterministic": True,
+    },
+    {
+        "name": "tail",
+        "category": "files",
+        "description": "Display last N lines of a file",
+        "parameters": {
             "type": "object",
             "properties": {
                 "filepath": {
@@ -199,15 +255,15 @@ def setup_agent(agent: BondAgent):
                     "description": "Number of lines to show (default: 10)"
                 }
             },
-            "required": ["filepath"],
+            "required": ["filepath"]
         },
-        function=tools.tail
-    )
-
-    agent.add_tool(
-        name="wc",
-        description="Count lines, words, and characters in a file",
-        parameters={
+        "deterministic": True,
+    },
+    {
+        "name": "wc",
+        "category": "files",
+        "description": "Count lines, words, and characters in a file",
+        "parameters": {
             "type": "object",
             "properties": {
                 "filepath": {
@@ -215,71 +271,68 @@ def setup_agent(agent: BondAgent):
                     "description": "Path to the file"
                 }
             },
-            "required": ["filepath"],
+            "required": ["filepath"]
         },
-        function=tools.wc
-    )
-
+        "deterministic": True,
+    },
     # System information tools
-    agent.add_tool(
-        name="whoami",
-        description="Display current user name",
-        parameters={
+    {
+        "name": "whoami",
+        "category": "system",
+        "description": "Display current user name",
+        "parameters": {
             "type": "object",
             "properties": {},
-            "required": [],
+            "required": []
         },
-        function=tools.whoami
-    )
-
-    agent.add_tool(
-        name="uname",
-        description="Display system information (OS, kernel, etc.)",
-        parameters={
+        "deterministic": True,
+    },
+    {
+        "name": "uname",
+        "category": "system",
+        "description": "Display system information (OS, kernel, etc.)",
+        "parameters": {
             "type": "object",
             "properties": {},
-            "required": [],
+            "required": []
         },
-        function=tools.uname
-    )
-
-    agent.add_tool(
-        name="df",
-        description="Display disk space usage for all filesystems",
-        parameters={
+        "deterministic": True,
+    },
+    {
+        "name": "df",
+        "category": "system",
+        "description": "Display disk space usage for all filesystems",
+        "parameters": {
             "type": "object",
             "properties": {},
-            "required": [],
+            "required": []
         },
-        function=tools.df
-    )
-
-    agent.add_tool(
-        name="ps",
-        description="Display currently running processes",
-        parameters={
+    },
+    {
+        "name": "ps",
+        "category": "system",
+        "description": "Display currently running processes",
+        "parameters": {
             "type": "object",
             "properties": {},
-            "required": [],
+            "required": []
         },
-        function=tools.ps
-    )
-
-    agent.add_tool(
-        name="env",
-        description="Display environment variables",
-        parameters={
+    },
+    {
+        "name": "env",
+        "category": "system",
+        "description": "Display environment variables",
+        "parameters": {
             "type": "object",
             "properties": {},
-            "required": [],
+            "required": []
         },
-        function=tools.env
-    )
-
-    agent.add_tool(
-        name="which",
-        description="Locate a command in the system PATH",
-        parameters={
+    },
+    {
+        "name": "which",
+        "category": "system",
+        "description": "Locate a command in the system PATH",
+        "parameters": {
             "type": "object",
             "properties": {
                 "command": {
@@ -287,16 +340,16 @@ def setup_agent(agent: BondAgent):
                     "description": "Command name to locate"
                 }
             },
-            "required": ["command"],
+            "required": ["command"]
         },
-        function=tools.which
-    )
-
+        "deterministic": True,
+    },
     # Network tools
-    agent.add_tool(
-        name="curl",
-        description="Fetch content from a URL",
-        parameters={
+    {
+        "name": "curl",
+        "category": "network",
+        "description": "Fetch content from a URL",
+        "parameters": {
             "type": "object",
             "properties": {
                 "url": {
@@ -308,16 +361,17 @@ def setup_agent(agent: BondAgent):
                     "description": "Additional curl options (e.g., '-I' for headers)"
                 }
             },
-            "required": ["url"],
+            "required": ["url"]
         },
-        function=tools.curl
-    )
-
+        "parallel_safe": _curl_read_only,
+        "side_effects": True,
+    },
     # GitHub CLI tool
-    agent.add_tool(
-        name="gh",
-        description="Execute GitHub CLI commands to interact with repositories, issues, PRs, releases, etc. Common commands: 'repo view', 'issue list', 'pr list', 'pr status', 'release list', 'status'",
-        parameters={
+    {
+        "name": "gh",
+        "category": "github",
+        "description": "Execute GitHub CLI commands to interact with repositories, issues, PRs, releases, etc. Common commands: 'repo view', 'issue list', 'pr list', 'pr status', 'release list', 'status'",
+        "parameters": {
             "type": "object",
             "properties": {
                 "command": {
@@ -325,16 +379,17 @@ def setup_agent(agent: BondAgent):
                     "description": "GitHub CLI command (without 'gh' prefix). Examples: 'repo view', 'issue list', 'pr list', 'pr status', 'release list', 'status', 'browse'"
                 }
             },
-            "required": ["command"],
+            "required": ["command"]
         },
-        function=tools.gh
-    )
-
+        "parallel_safe": _gh_read_only,
+        "side_effects": True,
+    },
     # Web search tool (Terminal Bench enhancement)
-    agent.add_tool(
-        name="web_search",
-        description="Search the web using Google with AI Overview extraction. Essential for finding commands, frameworks, and solutions. Based on Apex2's breakthrough technique.",
-        parameters={
+    {
+        "name": "web_search",
+        "category": "web",
+        "description": "Search the web using Google with AI Overview extraction. Essential for finding commands, frameworks, and solutions. Based on Apex2's breakthrough technique.",
+        "parameters": {
             "type": "object",
             "properties": {
                 "query": {
@@ -346,16 +401,15 @@ def setup_agent(agent: BondAgent):
                     "description": "Number of top results to analyze (default: 3)"
                 }
             },
-            "required": ["query"],
+            "required": ["query"]
         },
-        function=tools.web_search
-    )
-
+    },
     # Workspace management tools
-    agent.add_tool(
-        name="get_demo_workspace",
-        description="Get an isolated workspace directory for demo applications. ALWAYS use this before creating demo files to avoid polluting the project directory.",
-        parameters={
+    {
+        "name": "get_demo_workspace",
+        "category": "workspaces",
+        "description": "Get an isolated workspace directory for demo applications. ALWAYS use this before creating demo files to avoid polluting the project directory.",
+        "parameters": {
             "type": "object",
             "properties": {
                 "name": {
@@ -363,15 +417,15 @@ def setup_agent(agent: BondAgent):
                     "description": "Name of the demo (e.g., 'flask_app', 'react_todo')"
                 }
             },
-            "required": ["name"],
+            "required": ["name"]
         },
-        function=tools.get_demo_workspace
-    )
-
-    agent.add_tool(
-        name="get_test_workspace",
-        description="Get an isolated workspace directory for test files",
-        parameters={
+        "side_effects": True,
+    },
+    {
+        "name": "get_test_workspace",
+        "category": "workspaces",
+        "description": "Get an isolated workspace directory for test files",
+        "parameters": {
             "type": "object",
             "properties": {
                 "test_type": {
@@ -379,26 +433,25 @@ def setup_agent(agent: BondAgent):
                     "description": "Type of test (e.g., 'unit', 'integration', 'manual')"
                 }
             },
-            "required": [],
+            "required": []
         },
-        function=tools.get_test_workspace
-    )
-
-    agent.add_tool(
-        name="list_workspaces",
-        description="List all demo and test workspaces",
-        parameters={
+        "side_effects": True,
+    },
+    {
+        "name": "list_workspaces",
+        "category": "workspaces",
+        "description": "List all demo and test workspaces",
+        "parameters": {
             "type": "object",
             "properties": {},
-            "required": [],
+            "required": []
         },
-        function=tools.list_workspaces
-    )
-
-    agent.add_tool(
-        name="cleanup_workspaces",
-        description="Clean up old temporary workspaces (older than specified days)",
-        parameters={
+    },
+    {
+        "name": "cleanup_workspaces",
+        "category": "workspaces",
+        "description": "Clean up old temporary workspaces (older than specified days)",
+        "parameters": {
             "type": "object",
             "properties": {
                 "days": {
@@ -406,16 +459,16 @@ def setup_agent(agent: BondAgent):
                     "description": "Remove temp sessions older than this many days (default: 7)"
                 }
             },
-            "required": [],
+            "required": []
         },
-        function=tools.cleanup_workspaces
-    )
-
+        "side_effects": True,
+    },
     # Advanced execution tools
-    agent.add_tool(
-        name="tree",
-        description="Display directory tree structure. Useful for visualizing project layout.",
-        parameters={
+    {
+        "name": "tree",
+        "category": "files",
+        "description": "Display directory tree structure. Useful for visualizing project layout.",
+        "parameters": {
             "type": "object",
             "properties": {
                 "path": {
@@ -431,15 +484,14 @@ def setup_agent(agent: BondAgent):
                     "description": "Additional options: -a (all files), -d (dirs only), --gitignore (respect .gitignore), -I 'pattern' (ignore pattern)"
                 }
             },
-            "required": [],
+            "required": []
         },
-        function=tools.tree
-    )
-
-    agent.add_tool(
-        name="bash",
-        description="Execute arbitrary bash command. Use with caution.",
-        parameters={
+    },
+    {
+        "name": "bash",
+        "category": "advanced",
+        "description": "Execute arbitrary bash command. Use with caution.",
+        "parameters": {
             "type": "object",
             "properties": {
                 "command": {
@@ -447,10 +499,62 @@ def setup_agent(agent: BondAgent):
                     "description": "Bash command to execute"
                 }
             },
-            "required": ["command"],
+            "required": ["command"]
         },
-        function=tools.bash
-    )
+        "parallel_safe": False,
+        "side_effects": True,
+    },
+    {
+        "name": "batch",
+        "category": "advanced",
+        "description": "Execute several bash commands in sequence and return each one's output. Cheaper than separate bash calls for chains of small commands.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "commands": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Bash commands to execute, in order"
+                }
+            },
+            "required": ["commands"]
+        },
+        "parallel_safe": False,
+        "side_effects": True,
+    },
+]
+
+# Profiles select tool categories; None means every tool. Fewer tools means a
+# smaller tools payload on every LLM call.
+PROFILES = {
+    "full": None,
+    "minimal": {"files", "workspaces", "advanced"},
+}
+
+
+def setup_agent(agent: BondAgent, profile: str = "full"):
+    """
+    Register available tools with the agent.
+
+    Args:
+        agent: Agent to register tools with
+        profile: Name of a PROFILES entry selecting which tool categories to register
+    """
+    from bond import tools
+
+    categories = PROFILES[profile]
+    for spec in TOOL_SPECS:
+        if categories is not None and spec["category"] not in categories:
+            continue
+        agent.add_tool(
+            name=spec["name"],
+            description=spec["description"],
+            parameters=spec["parameters"],
+            function=getattr(tools, spec["name"]),
+            deterministic=spec.get("deterministic", False),
+            parallel_safe=spec.get("parallel_safe", True),
+            side_effects=spec.get("side_effects", False),
+        )
 
 
 def print_banner():
@@ -467,7 +571,7 @@ def print_banner():
     print("  • Web: web_search (Google with AI Overview) 🤖")
     print("  • Workspaces: get_demo_workspace, get_test_workspace, list_workspaces 🗂️")
     print("  • GitHub: gh (repos, issues, PRs, releases)")
-    print("  • Advanced: bash (execute arbitrary commands)")
+    print("  • Advanced: bash, batch (execute arbitrary commands)")
     print()
     print("Type '/help' for commands, '/exit' to quit")
     print("-" * 60)
@@ -482,6 +586,8 @@ def print_help():
     print("  /exit      - Exit the agent")
     print("  /reset     - Clear conversation context")
     print("  /context   - Show conversation history")
+    print("  /cache stats - Show response cache statistics")
+    print("  /cache clear - Empty the response cache")
     print()
     print("Examples:")
     print("  > ping 8.8.8.8")
@@ -506,8 +612,79 @@ def print_context(agent: BondAgent):
     print()
 
 
-def run_cli():
-    """Run the interactive CLI."""
+def exit_cli(agent: BondAgent) -> bool:
+    """Say goodbye and stop the main loop."""
+    print("Goodbye!")
+    return True
+
+
+def show_help(agent: BondAgent) -> bool:
+    """Print help and keep going."""
+    print_help()
+    return False
+
+
+def reset_agent(agent: BondAgent) -> bool:
+    """Clear the conversation context and keep going."""
+    agent.reset_context()
+    print("Context cleared.")
+    return False
+
+
+def show_context(agent: BondAgent) -> bool:
+    """Print the conversation context and keep going."""
+    print_context(agent)
+    return False
+
+
+def show_cache_stats(agent: BondAgent) -> bool:
+    """Print response cache statistics and keep going."""
+    stats = agent.response_cache.stats
+    print(f"Response cache: {len(agent.response_cache)} entries, "
+          f"{stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions")
+    return False
+
+
+def clear_cache(agent: BondAgent) -> bool:
+    """Empty the response cache and keep going."""
+    agent.response_cache.clear()
+    print("Response cache cleared.")
+    return False
+
+
+# Slash commands: handler(agent) returns True when the CLI should exit
+COMMANDS = {
+    '/exit': exit_cli,
+    '/quit': exit_cli,
+    '/help': show_help,
+    '/reset': reset_agent,
+    '/context': show_context,
+    '/cache stats': show_cache_stats,
+    '/cache clear': clear_cache,
+}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(prog="bond", description="Bond - LLM Agent with Tool Calling")
+    parser.add_argument(
+        "--profile",
+        choices=sorted(PROFILES),
+        default="full",
+        help="Tool set to register (default: full)",
+    )
+    return parser.parse_args(argv)
+
+
+def run_cli(argv: Optional[List[str]] = None):
+    """
+    Run the interactive CLI.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
+    args = parse_args(argv)
+
     # Setup signal handler for clean exit
     def signal_handler(sig, frame):
         print("\nGoodbye!")
@@ -517,8 +694,17 @@ def run_cli():
 
     # Initialize agent
     print("Initializing Bond agent...")
-    agent = BondAgent()
-    setup_agent(agent)
+    from bond.agent import BondAgent, NO_RESPONSE
+    from bond.cache import SQLiteBackend
+
+    agent = BondAgent(cache_backend=SQLiteBackend())
+    setup_agent(agent, profile=args.profile)
+
+    def write_delta(text: str):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    agent.on_text = write_delta
 
     # Print banner
     print_banner()
@@ -533,30 +719,26 @@ def run_cli():
                 print()
                 break
 
-            # Handle commands
-            if user_input.lower() in ['/exit', '/quit']:
-                print("Goodbye!")
-                break
-            elif user_input.lower() == '/help':
-                print_help()
-                continue
-            elif user_input.lower() == '/reset':
-                agent.reset_context()
-                print("Context cleared.")
-                continue
-            elif user_input.lower() == '/context':
-                print_context(agent)
-                continue
+            # Handle commands (only slash-prefixed input pays for the lookup)
+            if user_input.startswith('/'):
+                handler = COMMANDS.get(user_input.lower())
+                if handler:
+                    if handler(agent):
+                        break
+                    continue
             elif user_input == '':
                 continue
 
             # Process with agent (using enhanced intelligence)
             try:
                 response = agent.process_with_intelligence(user_input)
-                print(response)
+                if agent.stream and response != NO_RESPONSE:
+                    # Text was already written as it streamed in
+                    print()
+                else:
+                    print(response)
             except Exception as e:
                 print(f"Error: {str(e)}")
-                import traceback
                 traceback.print_exc()
 
     except KeyboardInterrupt:
@@ -4,35 +4,87 @@ Loads environment variables from settings.json file and provides configuration a
 """
 
 import json
+import mmap
 import os
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
 
+try:
+    import orjson  # Optional: C parser, skips the stdlib's per-token object churn
+except ImportError:
+    orjson = None
 
-def load_config() -> dict:
-    """Load configuration from settings.json file."""
+DEFAULT_BASE_URL = 'https://api.z.ai/api/anthropic'
+DEFAULT_MODEL = 'claude-3-5-sonnet-20241022'
+DEFAULT_TIMEOUT_MS = 3000000
+
+
+def _parse_bool(value) -> bool:
+    return str(value).lower() == 'true'
+
+
+# settings.json env key -> (config key, default, parser), applied in one pass
+_ENV_SCHEMA = (
+    ('ANTHROPIC_AUTH_TOKEN', 'auth_token', None, None),
+    ('ANTHROPIC_BASE_URL', 'base_url', DEFAULT_BASE_URL, None),
+    ('ANTHROPIC_MODEL', 'model', DEFAULT_MODEL, None),
+    ('API_TIMEOUT_MS', 'timeout_ms', DEFAULT_TIMEOUT_MS, int),
+    ('alwaysThinkingEnabled', 'always_thinking', 'true', _parse_bool),
+)
+
+
+def json_loads(data):
+    """Decode JSON bytes (or a buffer view) with orjson when installed, else the stdlib."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+
+def _load_json_file(path: Path):
+    """Decode a JSON file straight from a read-only memory map of it."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap refuses empty files; let the decoder report the error
+            return json_loads(b'')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return json_loads(view)
+
+
+def _env_from_dict(env_vars: dict) -> dict:
+    """Map a settings.json env dict onto config keys using _ENV_SCHEMA."""
+    config = {}
+    for env_key, config_key, default, parse in _ENV_SCHEMA:
+        value = env_vars.get(env_key, default)
+        config[config_key] = parse(value) if parse is not None and value is not None else value
+    return config
+
+
+@lru_cache(maxsize=1)
+def load_config() -> Mapping:
+    """
+    Load configuration from settings.json file.
+
+    The env block is decoded against a fixed schema: the precompiled
+    _ENV_SCHEMA table is applied to the parsed dict in one pass.
+
+    The result is cached for the life of the process and shared by every
+    caller, so it is returned as a read-only mapping; call
+    load_config.cache_clear() to pick up edits to settings.json.
+    """
     # Load settings.json file from the project root
     settings_path = Path(__file__).parent.parent / 'settings.json'
 
     try:
-        with open(settings_path, 'r') as f:
-            settings_data = json.load(f)
+        config = _env_from_dict(_load_json_file(settings_path).get('env', {}))
     except FileNotFoundError:
         raise FileNotFoundError(f"settings.json not found at {settings_path}")
     except json.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON in settings.json: {e}")
 
-    env_vars = settings_data.get('env', {})
-
-    config = {
-        'auth_token': env_vars.get('ANTHROPIC_AUTH_TOKEN'),
-        'base_url': env_vars.get('ANTHROPIC_BASE_URL', 'https://api.z.ai/api/anthropic'),
-        'model': env_vars.get('ANTHROPIC_MODEL', 'claude-3-5-sonnet-20241022'),
-        'timeout_ms': int(env_vars.get('API_TIMEOUT_MS', 3000000)),
-        'always_thinking': env_vars.get('alwaysThinkingEnabled', 'true').lower() == 'true',
-    }
-
     # Validate required config
     if not config['auth_token']:
         raise ValueError("ANTHROPIC_AUTH_TOKEN is required in settings.json")
 
-    return config
+    return MappingProxyType(config)
@@ -0,0 +1,46 @@
+"""
+Helpers shared by the API probe scripts at the repository root.
+Keeps one client per endpoint so the scripts reuse connection pools instead of each building their own.
+"""
+
+import atexit
+from functools import lru_cache
+
+import httpx
+from zai import ZaiClient
+
+try:
+    import h2  # noqa: F401  Optional: lets the pooled connections use HTTP/2
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+
+@lru_cache(maxsize=1)
+def _shared_http_client() -> httpx.Client:
+    """The one httpx client (pool, TLS context, DNS cache) behind every ZaiClient."""
+    client = httpx.Client(
+        http2=HTTP2,
+        limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=30),
+    )
+    atexit.register(client.close)
+    return client
+
+
+@lru_cache(maxsize=None)
+def get_shared_client(base_url: str, auth_token: str) -> ZaiClient:
+    """
+    Get the ZaiClient for an endpoint, creating it on first use.
+
+    Args:
+        base_url: API base URL
+        auth_token: API key sent with every request
+
+    Returns:
+        The same client for every call with the same base_url and auth_token
+    """
+    return ZaiClient(
+        api_key=auth_token,
+        base_url=base_url,
+        http_client=_shared_http_client(),
+    )
@@ -0,0 +1,53 @@
+"""
+Error classification for the API probe scripts.
+Maps the codes and phrases found in z.ai / MiniMax error messages to a category in one regex pass.
+"""
+
+import re
+from typing import Mapping, Optional, Sequence, Set
+
+# Markers in API error messages, mapped to what they mean
+ERROR_MARKERS = {
+    '1113': 'balance', 'Insufficient balance': 'balance',
+    '1211': 'unknown_model', 'Unknown Model': 'unknown_model',
+    '404': 'not_found', 'NOT_FOUND': 'not_found',
+    '401': 'auth', '403': 'auth', 'Unauthorized': 'auth',
+    '2003': 'params', '2013': 'params',
+}
+# One alternation over every marker, compiled once
+ERROR_RE = re.compile('|'.join(map(re.escape, ERROR_MARKERS)))
+
+
+def error_kinds(error_msg: str) -> Set[str]:
+    """Every error category marked in error_msg, found in one regex pass."""
+    return {ERROR_MARKERS[marker] for marker in ERROR_RE.findall(error_msg)}
+
+
+def classify(error_msg: str, priority: Sequence[str]) -> Optional[str]:
+    """
+    Pick the category that matters most for an error message.
+
+    Args:
+        error_msg: Error text returned by the API
+        priority: Categories to consider, most important first
+
+    Returns:
+        The first category in priority marked in error_msg, or None
+    """
+    found = error_kinds(error_msg)
+    return next((kind for kind in priority if kind in found), None)
+
+
+def diagnose(error_msg: str, hints: Mapping[str, str]) -> Optional[str]:
+    """
+    Look up the hint to print for an error message.
+
+    Args:
+        error_msg: Error text returned by the API
+        hints: Category -> hint text, most important category first
+
+    Returns:
+        The hint for the highest-priority category found, or None
+    """
+    kind = classify(error_msg, list(hints))
+    return hints[kind] if kind else None
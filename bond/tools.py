@@ -6,19 +6,372 @@ Following the Fly.io pattern:
 - Simple functions with clear signatures
 - Robust error handling with try/except
 - String returns for simplicity
-- Proper subprocess usage with text=True and stderr capture
+- Commands spawned directly, stdout and stderr merged and decoded as UTF-8
 """
 
 import subprocess
 import os
+import atexit
+import fnmatch
+import getpass
+import hashlib
+import io
 import json
+import math
+import operator
+import platform
 import re
-from typing import Any, Dict, Optional
-from urllib.parse import quote_plus
+import select
+import shlex
+import shutil
+import signal
+import stat
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from grp import getgrgid
+from itertools import islice
+from pathlib import Path
+from pwd import getpwuid
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 
+from bond.cache import LLMCache
+from bond.config import json_loads
+from bond.workspace import get_workspace_manager
+
+# web_search dependencies are optional; resolved once at import
+try:
+    import requests
+    from bs4 import BeautifulSoup
+    from requests.adapters import HTTPAdapter
+    _WEB_OK = True
+    _WEB_IMPORT_ERROR: Optional[ImportError] = None
+    # Shared session so repeat fetches reuse pooled keep-alive connections;
+    # the pool is sized to cover every _WEB_POOL worker at once
+    _SESSION = requests.Session()
+    _SESSION.headers["User-Agent"] = "Mozilla/5.0"
+    _SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+    _SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+except ImportError as e:
+    _WEB_OK = False
+    _WEB_IMPORT_ERROR = e
+
+try:
+    import msgspec  # Optional: decodes only the SerpAPI fields web_search reads
+except ImportError:
+    msgspec = None
+
+try:
+    from selectolax.parser import HTMLParser  # Optional: lexbor-backed, much faster than html.parser
+except ImportError:
+    HTMLParser = None
+
+# Read sizes for the in-process file tools
+_TAIL_CHUNK_SIZE = 8192
+_WC_CHUNK_SIZE = 1 << 16
+
+# Worker threads for web_search's network calls (search and page fetches)
+_WEB_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="bond-web")
+
+# Entries older than this show a year instead of a time in ls()
+_SIX_MONTHS = 31556952 // 2
+
+# Output cap for commands run through _run()
+_MAX_OUTPUT_BYTES = 1_000_000
+# Initial pipe read buffer; grows by doubling
+_READ_CHUNK_SIZE = 1 << 16
+
+# Seconds a cached web_search result stays fresh
+_WEB_CACHE_TTL = 3600
+
+# Recent find() results, revalidated against directory mtimes
+_FIND_CACHE = LLMCache(max_size=64, ttl=None)
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    """Return a path's st_mtime_ns, or None if it can't be stat'ed."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+# (command, PATH) -> resolved path, for commands shutil.which found
+_WHICH_HITS: Dict[Tuple[str, Optional[str]], str] = {}
+
+
+def _which_cached(command: str, search_path: Optional[str]) -> Optional[str]:
+    """
+    shutil.which memoized per (command, PATH).
+
+    Only hits are remembered, so a binary installed later (say through
+    bash) is found on the next lookup; a remembered hit that is no longer
+    executable is searched for again.
+    """
+    key = (command, search_path)
+    location = _WHICH_HITS.get(key)
+    if location is None or not os.access(location, os.X_OK):
+        location = shutil.which(command, path=search_path)
+        if location is not None:
+            _WHICH_HITS[key] = location
+        else:
+            _WHICH_HITS.pop(key, None)
+    return location
 
-def ping(host: str) -> str:
+
+# Signals Python ignores that a child should get back at their defaults,
+# the same set subprocess restores (restore_signals=True)
+_RESTORED_SIGNALS = tuple(
+    getattr(signal, name) for name in ("SIGPIPE", "SIGXFSZ") if hasattr(signal, name)
+)
+
+
+def _spawn(cmd: List[str]) -> Tuple[int, int]:
+    """
+    Start a command with posix_spawnp, stdout and stderr merged into a pipe.
+
+    posix_spawn lets the kernel use vfork-style process creation (glibc
+    implements it with clone(CLONE_VM | CLONE_VFORK)), so the cost doesn't
+    grow with the size of this (large) Python process the way fork() does.
+    SIGPIPE and SIGXFSZ are reset to their defaults in the child, so
+    pipelines like `yes | head` end quietly instead of failing with EPIPE.
+
+    Args:
+        cmd: Command and arguments (the command is looked up in PATH)
+
+    Returns:
+        Tuple of (child pid, read end of the output pipe)
+    """
+    # A resolved absolute path lets posix_spawn skip the per-call PATH search
+    search_path = os.environ.get("PATH")
+    executable = _which_cached(cmd[0], search_path) or cmd[0]
+    spawn = os.posix_spawn if os.path.isabs(executable) else os.posix_spawnp
+    read_fd, write_fd = os.pipe()
+    try:
+        # Both pipe ends are close-on-exec; only the dup'ed 1 and 2 survive.
+        # stdin is /dev/null so a command that prompts fails fast instead of
+        # blocking on (and stealing from) the CLI's terminal.
+        pid = spawn(executable, cmd, os.environ, file_actions=[
+            (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+            (os.POSIX_SPAWN_DUP2, write_fd, 1),
+            (os.POSIX_SPAWN_DUP2, write_fd, 2),
+        ], setsigdef=_RESTORED_SIGNALS)
+    except BaseException as e:
+        os.close(read_fd)
+        if isinstance(e, FileNotFoundError):
+            # The cached binary moved or was removed; look it up afresh next time
+            _WHICH_HITS.pop((cmd[0], search_path), None)
+        raise
+    finally:
+        os.close(write_fd)
+    return pid, read_fd
+
+
+def _pidfd_open(pid: int) -> Optional[int]:
+    """Return a pidfd for the child, or None where pidfds aren't supported (pre-5.3 kernels, non-Linux)."""
+    try:
+        return os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        return None
+
+
+class _OutputBuffer:
+    """
+    Command output read straight from a pipe into one growable bytearray.
+
+    readinto() fills the free tail of the buffer in place, so there is no
+    per-read bytes object and no re-concatenation; the buffer doubles only
+    when it is full, and never grows past max_bytes + 1 (the extra byte is
+    how truncation is detected).
+
+    Past the cap, reads go to a scratch buffer and are discarded, apart from
+    the last tail_bytes of the stream, which ends_with() still sees. That
+    lets a reader keep draining a pipe it can't kill (the bash session)
+    while watching for its end marker.
+    """
+
+    def __init__(self, fd: int, max_bytes: int, tail_bytes: int = 0):
+        self._pipe = io.FileIO(fd, "rb", closefd=False)
+        self._buf = bytearray(min(_READ_CHUNK_SIZE, max_bytes + 1))
+        self._scratch: Optional[bytearray] = None
+        self._tail = b""
+        self.size = 0
+        self.max_bytes = max_bytes
+        self.tail_bytes = tail_bytes
+
+    @property
+    def full(self) -> bool:
+        """True once more than max_bytes have been read."""
+        return self.size > self.max_bytes
+
+    def fill(self) -> Optional[int]:
+        """
+        Read once from the pipe.
+
+        Returns:
+            Bytes read, 0 at EOF, or None if a non-blocking pipe had no data
+        """
+        if self.full:
+            if self._scratch is None:
+                self._scratch = bytearray(_READ_CHUNK_SIZE)
+            n = self._pipe.readinto(self._scratch)
+            if n and self.tail_bytes:
+                self._tail = (self._tail + self._scratch[:n])[-self.tail_bytes:]
+            return n
+
+        if self.size == len(self._buf):
+            self._buf.extend(bytes(min(len(self._buf), self.max_bytes + 1 - self.size)))
+        with memoryview(self._buf) as view, view[self.size:] as free:
+            n = self._pipe.readinto(free)
+        if n:
+            self.size += n
+        return n
+
+    def drain(self) -> bool:
+        """
+        Read a non-blocking pipe until it is empty (or, without a tail to
+        track, until the cap is hit).
+
+        Returns:
+            False once the pipe reached EOF
+        """
+        while not (self.full and not self.tail_bytes):
+            n = self.fill()
+            if n is None:
+                return True
+            if n == 0:
+                return False
+        return True
+
+    def ends_with(self, suffix: bytes) -> bool:
+        """Whether the stream read so far ends with suffix (at most tail_bytes long once full)."""
+        if self.full:
+            end = bytes(self._buf[max(0, self.size - len(suffix)):self.size]) + self._tail
+        else:
+            end = self._buf[max(0, self.size - len(suffix)):self.size]
+        return end.endswith(suffix)
+
+    def text(self, strip_suffix: int = 0, limit: Optional[int] = None) -> str:
+        """
+        Decode the output, marking it if it was cut off.
+
+        Args:
+            strip_suffix: Bytes to drop from the end (ignored if full)
+            limit: Bytes to keep before marking truncation (defaults to max_bytes)
+        """
+        limit = self.max_bytes if limit is None else limit
+        end = self.max_bytes + 1 if self.full else self.size - strip_suffix
+        # Decode straight from a view of the buffer; slicing the bytearray
+        # would copy up to max_bytes first
+        with memoryview(self._buf) as view, view[:min(end, limit)] as data:
+            text = str(data, "utf-8", "replace")
+        return text + "\n...[truncated]" if end > limit else text
+
+
+def _run(cmd: List[str], timeout: Optional[float] = None, max_bytes: int = _MAX_OUTPUT_BYTES) -> str:
+    """
+    Run a command and return its combined stdout/stderr.
+
+    Output is read incrementally; once max_bytes have arrived the process is
+    killed and the output is marked as truncated, so a runaway command can't
+    balloon memory.
+
+    The child's pidfd is watched alongside the pipe, so the kernel wakes us
+    the moment the child exits, even if a background grandchild still holds
+    the pipe open.
+
+    Args:
+        cmd: Command and arguments
+        timeout: Seconds to wait for the command (None waits indefinitely)
+        max_bytes: Maximum number of output bytes to keep
+
+    Returns:
+        Command output
+
+    Raises:
+        subprocess.TimeoutExpired: If the command did not finish in time
+    """
+    pid, fd = _spawn(cmd)
+    pidfd = _pidfd_open(pid)
+    output = _OutputBuffer(fd, max_bytes)
+    exited = False
+    try:
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        watch = [fd] if pidfd is None else [fd, pidfd]
+        while fd in watch and not output.full:
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            ready = select.select(watch, [], [], remaining)[0]
+            if not ready:
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            if pidfd in ready:
+                # The child is gone: collect what it left in the pipe and stop
+                os.set_blocking(fd, False)
+                output.drain()
+                break
+            if not output.fill():
+                watch.remove(fd)
+
+        if not output.full and pidfd is not None and fd not in watch:
+            # EOF came first; wait for the exit under the same deadline
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            if remaining is not None and (remaining <= 0 or not select.select([pidfd], [], [], remaining)[0]):
+                raise subprocess.TimeoutExpired(cmd, timeout)
+        if not output.full:
+            os.waitpid(pid, 0)
+            exited = True
+    finally:
+        os.close(fd)
+        if pidfd is not None:
+            os.close(pidfd)
+        if not exited:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+
+    return output.text()
+
+
+def shellout(timeout: Optional[float] = None):
+    """
+    Turn a function that builds an argv into a tool that runs it.
+
+    The decorated function only returns the command line; running it through
+    _run() and mapping failures to error strings happens here, so every
+    binary-backed tool shares one execution path. The resulting tool also
+    takes a keyword-only max_bytes, passed on to _run(): once the output
+    exceeds it the command is killed and the output marked as truncated.
+
+    Args:
+        timeout: Seconds before the command is killed (None waits forever)
+
+    Returns:
+        Decorator producing a tool that returns the command's output
+    """
+    def decorate(build_argv):
+        @wraps(build_argv)
+        def tool(*args, max_bytes: int = _MAX_OUTPUT_BYTES, **kwargs) -> str:
+            try:
+                cmd = build_argv(*args, **kwargs)
+                return _run(cmd, timeout=timeout, max_bytes=max_bytes)
+            except subprocess.TimeoutExpired:
+                return f"error: {cmd[0]} command timed out after {timeout} seconds"
+            except Exception as e:
+                return f"error: {e}"
+
+        tool.__annotations__ = {**build_argv.__annotations__, "return": str}
+        return tool
+
+    return decorate
+
+
+@shellout()
+def ping(host: str) -> List[str]:
     """
     Ping some host on the internet.
 
@@ -28,28 +381,19 @@ def ping(host: str) -> str:
     Returns:
         Ping command output or error message
     """
-    try:
-        result = subprocess.run(
-            ["ping", "-c", "5", host],
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE
-        )
-        return result.stdout
-    except Exception as e:
-        return f"error: {e}"
+    return ["ping", "-c", "5", host]
 
 
+@lru_cache(maxsize=1)
 def get_system_info() -> Dict[str, Any]:
     """
     Get basic system information.
 
+    These values can't change while the process runs, so they are computed once.
+
     Returns:
         Dictionary with system details
     """
-    import platform
-    import sys
-
     return {
         "platform": platform.platform(),
         "python_version": sys.version,
@@ -71,6 +415,19 @@ def echo(message: str) -> str:
     return f"Echo: {message}"
 
 
+def _divide(x: float, y: float) -> float:
+    return x / y if y != 0 else float('inf')
+
+
+# Operations supported by calculate(), built once
+_OPS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": _divide,
+}
+
+
 def calculate(operation: str, a: float, b: float) -> float:
     """
     Perform a basic calculation.
@@ -83,93 +440,214 @@ def calculate(operation: str, a: float, b: float) -> float:
     Returns:
         Result of the calculation
     """
-    operations = {
-        "add": lambda x, y: x + y,
-        "subtract": lambda x, y: x - y,
-        "multiply": lambda x, y: x * y,
-        "divide": lambda x, y: x / y if y != 0 else float('inf'),
-    }
-
-    if operation not in operations:
+    func = _OPS.get(operation)
+    if func is None:
         raise ValueError(f"Unsupported operation: {operation}")
 
-    return operations[operation](a, b)
+    return func(a, b)
 
 
 # ============================================================
 # Bash/System Tools
 # ============================================================
 
-def ls(path: str = ".") -> str:
+@lru_cache(maxsize=256)
+def _user_name(uid: int) -> str:
+    try:
+        return getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+@lru_cache(maxsize=256)
+def _group_name(gid: int) -> str:
+    try:
+        return getgrgid(gid).gr_name
+    except KeyError:
+        return str(gid)
+
+
+def _human_size(size: int) -> str:
+    """Format a byte count the way ls -h does (powers of 1024, rounded up)."""
+    if size < 1024:
+        return str(size)
+    value = float(size)
+    for unit in "KMGTPE":
+        value /= 1024
+        if value < 10 and math.ceil(value * 10) < 100:
+            return f"{math.ceil(value * 10) / 10:.1f}{unit}"
+        if math.ceil(value) < 1024:
+            return f"{math.ceil(value)}{unit}"
+    return f"{math.ceil(value)}E"
+
+
+def _ls_time(mtime: float, now: float) -> str:
+    """Format a timestamp like ls -l: clock time if recent, otherwise the year."""
+    dt = datetime.fromtimestamp(mtime)
+    if now - _SIX_MONTHS < mtime <= now:
+        return f"{dt:%b} {dt.day:>2} {dt:%H:%M}"
+    return f"{dt:%b} {dt.day:>2}  {dt.year}"
+
+
+def ls(path: str = ".", force_shell: bool = False) -> str:
     """
     List directory contents.
 
+    Produces an `ls -lah` style long listing from os.lstat/os.scandir
+    without running ls.
+
     Args:
         path: Directory path to list (defaults to current directory)
+        force_shell: Run the system command instead of the in-process version
 
     Returns:
         Directory listing or error message
     """
     try:
-        result = subprocess.run(
-            ["ls", "-lah", path],
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=10
-        )
-        return result.stdout
+        if force_shell:
+            return _run(["ls", "-lah", path], timeout=10)
+        st = os.lstat(path)
+        if stat.S_ISDIR(st.st_mode):
+            rows = [(".", st), ("..", os.lstat(os.path.join(path, "..")))]
+            with os.scandir(path) as it:
+                rows.extend(sorted(
+                    ((entry.name, entry.stat(follow_symlinks=False)) for entry in it),
+                    key=lambda row: row[0],
+                ))
+            header = [f"total {_human_size(sum(row[1].st_blocks for row in rows) * 512)}"]
+        else:
+            rows = [(path, st)]
+            header = []
+
+        now = time.time()
+        fields = []
+        for name, st in rows:
+            if stat.S_ISLNK(st.st_mode):
+                link = path if name == path else os.path.join(path, name)
+                name = f"{name} -> {os.readlink(link)}"
+            fields.append((
+                stat.filemode(st.st_mode),
+                str(st.st_nlink),
+                _user_name(st.st_uid),
+                _group_name(st.st_gid),
+                _human_size(st.st_size),
+                _ls_time(st.st_mtime, now),
+                name,
+            ))
+
+        # Pad link count, owner, group and size to their column widths
+        widths = [max(len(row[i]) for row in fields) for i in range(1, 5)]
+        lines = header + [
+            f"{mode} {nlink:>{widths[0]}} {user:<{widths[1]}} {group:<{widths[2]}} "
+            f"{size:>{widths[3]}} {mtime} {name}"
+            for mode, nlink, user, group, size, mtime, name in fields
+        ]
+        return "".join(f"{line}\n" for line in lines)
     except Exception as e:
         return f"error: {e}"
 
 
-def pwd() -> str:
+def pwd(force_shell: bool = False) -> str:
     """
     Print working directory.
 
+    Args:
+        force_shell: Run the system command instead of the in-process version
+
     Returns:
         Current working directory path or error message
     """
     try:
-        result = subprocess.run(
-            ["pwd"],
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=5
-        )
-        return result.stdout.strip()
+        if force_shell:
+            return _run(["pwd"], timeout=10).strip()
+        return os.getcwd()
     except Exception as e:
         return f"error: {e}"
 
 
-def cat(filepath: str) -> str:
+def _read_bytes(filepath: str) -> bytes:
+    """
+    Read a whole file with as few syscalls as possible.
+
+    An unbuffered FileIO sizes its buffer from fstat() and fills it with a
+    single read(), skipping the buffered and text-decoding layers; callers
+    decode the result once.
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        File contents
+    """
+    with open(filepath, "rb", buffering=0) as f:
+        return f.readall()
+
+
+def cat(filepath: str, force_shell: bool = False) -> str:
     """
     Display file contents.
 
     Args:
         filepath: Path to the file to display
+        force_shell: Run the system command instead of the in-process version
 
     Returns:
         File contents or error message
     """
     try:
-        result = subprocess.run(
-            ["cat", filepath],
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=10
-        )
-        return result.stdout
+        if force_shell:
+            return _run(["cat", filepath], timeout=10)
+        return _read_bytes(filepath).decode(errors="replace")
     except Exception as e:
         return f"error: {e}"
 
 
+@lru_cache(maxsize=256)
+def _compile(pattern: str) -> re.Pattern:
+    """Compile a regex once per distinct pattern."""
+    return re.compile(pattern)
+
+
+# Characters that give a pattern regex meaning; without them it's a literal
+_REGEX_META = frozenset(".^$*+?{}[]\\|()\n")
+
+
+def _grep_literal(needle: str, text: str) -> List[str]:
+    """
+    Find the lines containing a fixed string.
+
+    str.find jumps straight to each occurrence, so the cost scales with the
+    number of matches rather than with a regex call per line; line numbers
+    come from counting newlines between consecutive hits.
+
+    Args:
+        needle: Non-empty string to look for
+        text: File contents
+
+    Returns:
+        Matching lines formatted like grep()
+    """
+    matches = []
+    number, counted = 1, 0
+    pos = text.find(needle)
+    while pos != -1:
+        start = text.rfind("\n", 0, pos) + 1
+        end = text.find("\n", pos)
+        if end == -1:
+            end = len(text)
+        number += text.count("\n", counted, start)
+        counted = start
+        matches.append(f"{number}:{text[start:end]}\n")
+        pos = text.find(needle, end + 1)  # Resume on the next line
+    return matches
+
+
 def grep(pattern: str, filepath: str) -> str:
     """
     Search for pattern in file.
 
+    Matching uses Python regular expression syntax.
+
     Args:
         pattern: Pattern to search for
         filepath: File to search in
@@ -178,14 +656,21 @@ def grep(pattern: str, filepath: str) -> str:
         Matching lines or error message
     """
     try:
-        result = subprocess.run(
-            ["grep", "-n", pattern, filepath],
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=10
-        )
-        return result.stdout if result.stdout else "No matches found"
+        text = _read_bytes(filepath).decode(errors="replace")
+        if pattern and _REGEX_META.isdisjoint(pattern):
+            matches = _grep_literal(pattern, text)
+            return "".join(matches) if matches else "No matches found"
+
+        regex = _compile(pattern)
+        lines = text.split("\n")
+        if lines[-1] == "":
+            lines.pop()  # A trailing newline ends the last line
+        matches = [
+            f"{number}:{line}\n"
+            for number, line in enumerate(lines, 1)
+            if regex.search(line)
+        ]
+        return "".join(matches) if matches else "No matches found"
     except Exception as e:
         return f"error: {e}"
 
@@ -194,6 +679,11 @@ def find(path: str, name_pattern: str = "*") -> str:
     """
     Find files matching a pattern.
 
+    Walks the tree with os.scandir, whose directory entries already carry
+    the file type, so no per-entry stat() is needed. Results are cached
+    together with the mtime of every directory visited; a repeat search is
+    answered from the cache as long as none of those directories changed.
+
     Args:
         path: Directory to search in
         name_pattern: Filename pattern to match (defaults to all files)
@@ -202,94 +692,165 @@ def find(path: str, name_pattern: str = "*") -> str:
         List of matching files or error message
     """
     try:
-        result = subprocess.run(
-            ["find", path, "-name", name_pattern],
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=30
-        )
-        return result.stdout
+        key = "\0".join((os.getcwd(), path, name_pattern))
+        cached = _FIND_CACHE.get(key)
+        if cached is not None:
+            mtimes, result = cached
+            if all(_mtime_ns(directory) == mtime for directory, mtime in mtimes.items()):
+                return result
+
+        matches = []
+        mtimes = {}
+        # Like find, the starting point itself is tested against the pattern
+        if fnmatch.fnmatchcase(os.path.basename(path.rstrip("/")) or path, name_pattern):
+            matches.append(path)
+
+        def scan(directory: str) -> list:
+            """Entries of directory in readdir order; records its mtime."""
+            mtimes[directory] = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as it:
+                return list(it)
+
+        try:
+            children = scan(path)
+        except NotADirectoryError:
+            children = []
+
+        # Depth-first in pre-order, like find: a directory is listed, then
+        # everything under it, then its next sibling. Children are pushed in
+        # reverse so they pop in readdir order.
+        stack = children[::-1]
+        while stack:
+            entry = stack.pop()
+            if fnmatch.fnmatchcase(entry.name, name_pattern):
+                matches.append(entry.path)
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.extend(reversed(scan(entry.path)))
+            except OSError:
+                # Unreadable or vanished subdirectories are skipped, as find does
+                mtimes.pop(entry.path, None)
+
+        result = "".join(f"{match}\n" for match in matches)
+        _FIND_CACHE.set(key, (mtimes, result))
+        return result
     except Exception as e:
         return f"error: {e}"
 
 
-def df() -> str:
+def _unescape_mount(field: str) -> str:
+    """Decode the octal escapes (e.g. \\040 for space) used in /proc/self/mounts."""
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), field)
+
+
+def df(force_shell: bool = False) -> str:
     """
     Display disk space usage.
 
+    Reads the mount table from /proc/self/mounts and sizes each filesystem
+    with os.statvfs, formatted like `df -h`. Pseudo filesystems (no blocks)
+    and repeat mounts of the same device are left out, as df does.
+
+    Args:
+        force_shell: Run the system command instead of the in-process version
+
     Returns:
         Disk space information or error message
     """
     try:
-        result = subprocess.run(
-            ["df", "-h"],
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=10
+        if force_shell:
+            return _run(["df", "-h"], timeout=10)
+
+        rows = [("Filesystem", "Size", "Used", "Avail", "Use%", "Mounted on")]
+        seen = set()
+        with open("/proc/self/mounts") as f:
+            for line in f:
+                source, target = (_unescape_mount(field) for field in line.split()[:2])
+                try:
+                    st = os.statvfs(target)
+                    device = os.stat(target).st_dev
+                except OSError:
+                    continue
+                if st.f_blocks == 0 or device in seen:
+                    continue
+                seen.add(device)
+
+                used = (st.f_blocks - st.f_bfree) * st.f_frsize
+                avail = st.f_bavail * st.f_frsize
+                percent = f"{math.ceil(used * 100 / (used + avail))}%" if used + avail else "-"
+                rows.append((
+                    source,
+                    _human_size(st.f_blocks * st.f_frsize),
+                    _human_size(used),
+                    _human_size(avail),
+                    percent,
+                    target,
+                ))
+
+        # df's minimum column widths: 14 for the source, 5 for sizes, 4 for Use%
+        widths = [
+            max(minimum, max(len(row[i]) for row in rows))
+            for i, minimum in enumerate((14, 5, 5, 5, 4))
+        ]
+        return "".join(
+            f"{row[0]:<{widths[0]}} {row[1]:>{widths[1]}} {row[2]:>{widths[2]}} "
+            f"{row[3]:>{widths[3]}} {row[4]:>{widths[4]}} {row[5]}\n"
+            for row in rows
         )
-        return result.stdout
     except Exception as e:
         return f"error: {e}"
 
 
-def ps() -> str:
+@shellout(timeout=10)
+def ps() -> List[str]:
     """
     Display running processes.
 
     Returns:
         Process list or error message
     """
-    try:
-        result = subprocess.run(
-            ["ps", "aux"],
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=10
-        )
-        return result.stdout
-    except Exception as e:
-        return f"error: {e}"
+    return ["ps", "aux"]
 
 
-def whoami() -> str:
+def whoami(force_shell: bool = False) -> str:
     """
     Display current user.
 
+    Args:
+        force_shell: Run the system command instead of the in-process version
+
     Returns:
         Current username or error message
     """
     try:
-        result = subprocess.run(
-            ["whoami"],
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=5
-        )
-        return result.stdout.strip()
+        if force_shell:
+            return _run(["whoami"], timeout=10).strip()
+        return getpass.getuser()
     except Exception as e:
         return f"error: {e}"
 
 
-def uname() -> str:
+@lru_cache(maxsize=1)
+def _uname_line() -> str:
+    """os.uname() as one line; fixed for the life of the process."""
+    u = os.uname()
+    return f"{u.sysname} {u.nodename} {u.release} {u.version} {u.machine}"
+
+
+def uname(force_shell: bool = False) -> str:
     """
     Display system information.
 
+    Args:
+        force_shell: Run the system command instead of the in-process version
+
     Returns:
         System information or error message
     """
     try:
-        result = subprocess.run(
-            ["uname", "-a"],
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=5
-        )
-        return result.stdout.strip()
+        if force_shell:
+            return _run(["uname", "-a"], timeout=10).strip()
+        return _uname_line()
     except Exception as e:
         return f"error: {e}"
 
@@ -306,143 +867,305 @@ def curl(url: str, options: str = "") -> str:
         Response content or error message
     """
     try:
+        flags = options.split()
+        # The common cases go through the pooled session instead of forking curl
+        if _WEB_OK and set(flags) <= _CURL_IN_PROCESS_FLAGS:
+            return _curl_session(url, head="-I" in flags, follow="-L" in flags)
+
         cmd = ["curl", "-sS"]
-        if options:
-            cmd.extend(options.split())
+        cmd.extend(flags)
         cmd.append(url)
         
-        result = subprocess.run(
-            cmd,
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=30
-        )
-        return result.stdout
+        return _run(cmd, timeout=30)
     except Exception as e:
         return f"error: {e}"
 
 
-def which(command: str) -> str:
+# curl options _curl_session can reproduce; anything else runs the binary
+_CURL_IN_PROCESS_FLAGS = {"-I", "-L"}
+
+
+def _format_headers(response: "requests.Response") -> str:
+    """Render a response's status line and headers the way curl -I prints them."""
+    version = {10: "HTTP/1.0", 11: "HTTP/1.1", 20: "HTTP/2"}.get(response.raw.version, "HTTP/1.1")
+    lines = [f"{version} {response.status_code} {response.reason}"]
+    lines.extend(f"{name}: {value}" for name, value in response.headers.items())
+    return "\r\n".join(lines) + "\r\n\r\n"
+
+
+def _curl_session(url: str, head: bool, follow: bool) -> str:
+    """
+    Fetch a URL over the shared keep-alive session.
+
+    Mirrors curl -sS: the body is returned whatever the status code, -I
+    returns the headers of every hop instead, and length is capped like _run.
+    Like curl, a URL without a scheme is fetched over http://.
+    """
+    if "://" not in url:
+        url = "http://" + url
+    with _SESSION.request(
+        "HEAD" if head else "GET", url, allow_redirects=follow, stream=True, timeout=30
+    ) as response:
+        if head:
+            return "".join(_format_headers(r) for r in (*response.history, response))
+
+        body = bytearray()
+        for chunk in response.iter_content(_READ_CHUNK_SIZE):
+            body += chunk
+            if len(body) > _MAX_OUTPUT_BYTES:
+                return body[:_MAX_OUTPUT_BYTES].decode(errors="replace") + "\n...[truncated]"
+        return body.decode(errors="replace")
+
+
+def which(command: str, force_shell: bool = False) -> str:
     """
     Locate a command in PATH.
 
     Args:
         command: Command name to locate
+        force_shell: Run the system command instead of the in-process version
 
     Returns:
         Full path to command or error message
     """
     try:
-        result = subprocess.run(
-            ["which", command],
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=5
-        )
-        return result.stdout.strip() if result.stdout else f"command not found: {command}"
+        if force_shell:
+            return _run(["which", command], timeout=10).strip() or f"command not found: {command}"
+        location = _which_cached(command, os.environ.get("PATH"))
+        return location if location else f"command not found: {command}"
     except Exception as e:
         return f"error: {e}"
 
 
-def env() -> str:
+def env(force_shell: bool = False) -> str:
     """
     Display environment variables.
 
+    Args:
+        force_shell: Run the system command instead of the in-process version
+
     Returns:
         Environment variables or error message
     """
     try:
-        result = subprocess.run(
-            ["env"],
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=5
-        )
-        return result.stdout
+        if force_shell:
+            return _run(["env"], timeout=10)
+        return "".join(f"{key}={value}\n" for key, value in os.environ.items())
     except Exception as e:
         return f"error: {e}"
 
 
-def head(filepath: str, lines: int = 10) -> str:
+def head(filepath: str, lines: int = 10, force_shell: bool = False) -> str:
     """
     Display first N lines of a file.
 
+    Lines are split on b"\n" only, so line endings come back untouched.
+
     Args:
         filepath: Path to file
-        lines: Number of lines to show (default 10)
+        lines: Number of lines to show (default 10); negative shows all
+               but the last -lines lines, like head -n -N
+        force_shell: Run the system command instead of the in-process version
 
     Returns:
         First N lines or error message
     """
     try:
-        result = subprocess.run(
-            ["head", f"-n{lines}", filepath],
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=10
-        )
-        return result.stdout
+        if force_shell:
+            return _run(["head", "-n", str(lines), filepath], timeout=10)
+        if lines < 0:
+            # bytes.splitlines() would also split on a bare \r
+            data = _read_bytes(filepath)
+            kept = data.split(b"\n")
+            if kept[-1] == b"":
+                kept.pop()
+            kept = kept[:lines]
+            return b"\n".join(kept).decode(errors="replace") + ("\n" if kept else "")
+        with open(filepath, "rb") as f:
+            return b"".join(islice(f, lines)).decode(errors="replace")
     except Exception as e:
         return f"error: {e}"
 
 
-def tail(filepath: str, lines: int = 10) -> str:
+def tail(filepath: str, lines: int = 10, force_shell: bool = False) -> str:
     """
     Display last N lines of a file.
 
+    Reads backwards from the end in fixed-size chunks, so only the tail of
+    a large file is ever read.
+
     Args:
         filepath: Path to file
         lines: Number of lines to show (default 10)
+        force_shell: Run the system command instead of the in-process version
 
     Returns:
         Last N lines or error message
     """
     try:
-        result = subprocess.run(
-            ["tail", f"-n{lines}", filepath],
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=10
-        )
-        return result.stdout
+        if force_shell:
+            return _run(["tail", "-n", str(lines), filepath], timeout=10)
+        if lines <= 0:
+            return ""
+        with open(filepath, "rb") as f:
+            pos = f.seek(0, os.SEEK_END)
+            data = b""
+            # One newline more than requested marks where the first wanted line starts
+            while pos > 0 and data.count(b"\n") <= lines:
+                step = min(_TAIL_CHUNK_SIZE, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+
+        # A trailing newline ends the last line rather than starting a new one
+        index = len(data) - 1 if data.endswith(b"\n") else len(data)
+        for _ in range(lines):
+            index = data.rfind(b"\n", 0, index)
+            if index < 0:
+                break
+        return data[index + 1:].decode(errors="replace")
     except Exception as e:
         return f"error: {e}"
 
 
-def wc(filepath: str) -> str:
+def wc(filepath: str, force_shell: bool = False) -> str:
     """
     Count lines, words, and characters in a file.
 
     Args:
         filepath: Path to file
+        force_shell: Run the system command instead of the in-process version
 
     Returns:
         Line, word, and character counts or error message
     """
     try:
-        result = subprocess.run(
-            ["wc", filepath],
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=10
-        )
-        return result.stdout
+        if force_shell:
+            return _run(["wc", filepath], timeout=10)
+        line_count = word_count = byte_count = 0
+        in_word = False
+        with open(filepath, "rb") as f:
+            for chunk in iter(lambda: f.read(_WC_CHUNK_SIZE), b""):
+                line_count += chunk.count(b"\n")
+                byte_count += len(chunk)
+                words = len(chunk.split())
+                # A word straddling the chunk boundary was counted in both chunks
+                if in_word and words and not chunk[:1].isspace():
+                    words -= 1
+                word_count += words
+                in_word = not chunk[-1:].isspace()
+
+        # Same layout as coreutils wc: columns as wide as the largest count
+        width = len(str(max(line_count, word_count, byte_count)))
+        return f"{line_count:>{width}} {word_count:>{width}} {byte_count:>{width}} {filepath}\n"
     except Exception as e:
         return f"error: {e}"
 
 
+class _BashSession:
+    """
+    Long-lived bash process that runs commands one at a time.
+
+    Spawning a fresh `bash -c` per call dominates the cost of short commands,
+    so one shell is kept alive and fed commands over stdin. Each command is
+    followed by a unique marker; output is read until the marker appears.
+
+    Every command runs in a subshell started in Python's working directory,
+    so like `bash -c` nothing it does (cd, exec redirections, set -e, exit)
+    outlives the call or leaves bash out of step with the other tools.
+    """
+
+    def __init__(self):
+        self.proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _start(self):
+        # Own process group so a timeout can take down the command's children too
+        self.proc = subprocess.Popen(
+            ["bash"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+            start_new_session=True,
+        )
+        # Reads drain whatever is available and return to select()
+        os.set_blocking(self.proc.stdout.fileno(), False)
+
+    def close(self):
+        """Kill the shell (it is restarted on the next run)."""
+        if self.proc is None:
+            return
+        try:
+            os.killpg(self.proc.pid, signal.SIGKILL)
+        except OSError:
+            pass
+        self.proc.wait()
+        self.proc.stdin.close()
+        self.proc.stdout.close()
+        self.proc = None
+
+    def run(self, command: str, timeout: float, max_bytes: int = _MAX_OUTPUT_BYTES) -> str:
+        """
+        Run a command and return its combined stdout/stderr.
+
+        Args:
+            command: Bash command to execute
+            timeout: Seconds to wait for the command to finish
+            max_bytes: Maximum number of output bytes to keep (the rest is
+                read and discarded so the shell stays in sync)
+
+        Returns:
+            Command output
+
+        Raises:
+            subprocess.TimeoutExpired: If the command did not finish in time
+        """
+        with self._lock:
+            if self.proc is None or self.proc.poll() is not None:
+                self.close()
+                self._start()
+
+            marker = f"__BOND_EOF_{uuid.uuid4().hex}__"
+            terminator = f"\n{marker}\n".encode()
+            # eval keeps syntax errors from killing the shell; stdin is detached
+            # so the command can't swallow what follows it
+            script = (
+                f"( cd -- {shlex.quote(os.getcwd())} && eval {shlex.quote(command)} ) < /dev/null 2>&1\n"
+                f"printf '\\n%s\\n' {marker}\n"
+            )
+            self.proc.stdin.write(script.encode())
+
+            fd = self.proc.stdout.fileno()
+            deadline = time.monotonic() + timeout
+            # Room for the marker past the cap, so it is never cut in two
+            output = _OutputBuffer(fd, max_bytes + len(terminator), tail_bytes=len(terminator))
+            while not output.ends_with(terminator):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                    self.close()
+                    raise subprocess.TimeoutExpired(command, timeout)
+                if not output.drain():
+                    # The command exited the shell; start a new one next time
+                    self.close()
+                    return output.text(limit=max_bytes)
+
+            return output.text(strip_suffix=len(terminator), limit=max_bytes)
+
+
+_BASH = _BashSession()
+
+
 def bash(command: str) -> str:
     """
     Execute arbitrary bash command.
     
     WARNING: Use with caution - allows arbitrary command execution.
 
+    Commands are fed to a persistent shell but each runs in its own
+    subshell, so `cd` and variables don't carry over to later calls.
+
     Args:
         command: Bash command to execute
 
@@ -450,21 +1173,43 @@ def bash(command: str) -> str:
         Command output or error message
     """
     try:
-        result = subprocess.run(
-            ["bash", "-c", command],
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=60
-        )
-        return result.stdout
+        return _BASH.run(command, timeout=60)
     except subprocess.TimeoutExpired:
         return "error: command timed out after 60 seconds"
     except Exception as e:
         return f"error: {e}"
 
 
-def tree(path: str = ".", level: int = None, options: str = "") -> str:
+def batch(commands: List[str]) -> List[str]:
+    """
+    Execute several bash commands in one go.
+
+    The commands run back to back in the persistent bash session, so a
+    chain of small commands costs one tool call and no new processes.
+    They share a single 60 second budget.
+
+    Args:
+        commands: Bash commands to execute, in order
+
+    Returns:
+        One output (or error message) per command; if the budget runs out,
+        the list ends with the timed-out command's error
+    """
+    outputs = []
+    deadline = time.monotonic() + 60
+    for command in commands:
+        try:
+            outputs.append(_BASH.run(command, timeout=max(0.0, deadline - time.monotonic())))
+        except subprocess.TimeoutExpired:
+            outputs.append("error: command timed out after 60 seconds")
+            break
+        except Exception as e:
+            outputs.append(f"error: {e}")
+    return outputs
+
+
+@shellout(timeout=30)
+def tree(path: str = ".", level: int = None, options: str = "") -> List[str]:
     """
     Display directory tree structure.
 
@@ -477,34 +1222,25 @@ def tree(path: str = ".", level: int = None, options: str = "") -> str:
     Returns:
         Tree structure or error message
     """
-    try:
-        cmd = ["tree"]
-        
-        # Add level limit if specified
-        if level is not None:
-            cmd.extend(["-L", str(level)])
-        
-        # Add custom options if specified
-        if options:
-            # Split options string and add them
-            cmd.extend(options.split())
-        
-        # Add the path
-        cmd.append(path)
-        
-        result = subprocess.run(
-            cmd,
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=30
-        )
-        return result.stdout
-    except Exception as e:
-        return f"error: {e}"
+    cmd = ["tree"]
+    
+    # Add level limit if specified
+    if level is not None:
+        cmd.extend(["-L", str(level)])
+    
+    # Add custom options if specified
+    if options:
+        # Split options string and add them
+        cmd.extend(options.split())
+    
+    # Add the path
+    cmd.append(path)
+    
+    return cmd
 
 
-def gh(command: str) -> str:
+@shellout(timeout=60)
+def gh(command: str) -> List[str]:
     """
     Execute GitHub CLI (gh) commands.
     
@@ -526,32 +1262,153 @@ def gh(command: str) -> str:
     Args:
         command: GitHub CLI command to execute (without 'gh' prefix)
                  Examples: "repo view", "issue list", "pr status"
+        max_bytes: Keyword-only, via @shellout; stop gh once its output
+                   exceeds this many bytes (defaults to the 1 MB cap)
     
     Returns:
         Command output or error message
     """
-    try:
-        # Build the gh command
-        cmd = ["gh"] + command.split()
-        
-        result = subprocess.run(
-            cmd,
-            text=True,
-            stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE,
-            timeout=60
-        )
-        return result.stdout
-    except subprocess.TimeoutExpired:
-        return "error: gh command timed out after 60 seconds"
-    except Exception as e:
-        return f"error: {e}"
+    # Build the gh command
+    return ["gh"] + command.split()
 
 
 # ============================================================
 # Web Search Tools (Terminal Bench Enhancement)
 # ============================================================
 
+SERPAPI_URL = "https://serpapi.com/search.json"
+
+if msgspec is not None:
+    # Left loose so a null or odd-typed field falls back for that result
+    # instead of failing the whole decode
+    class _SerpResult(msgspec.Struct):
+        title: Any = None
+        snippet: Any = None
+        link: Any = None
+
+    class _SerpResponse(msgspec.Struct):
+        answer_box: Dict[str, Any] = {}
+        organic_results: List[_SerpResult] = []
+        error: Optional[str] = None
+
+    _SERP_DECODER = msgspec.json.Decoder(_SerpResponse)
+
+
+def _serpapi_search(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Query SerpAPI's REST endpoint directly.
+
+    Only answer_box, organic_results (title/snippet/link) and error are
+    used. With msgspec installed the rest of the response is skipped
+    during decoding instead of being built into Python objects.
+
+    Args:
+        params: SerpAPI query parameters
+
+    Returns:
+        Dictionary with the fields above
+    """
+    response = _SESSION.get(SERPAPI_URL, params=params, timeout=15)
+    if msgspec is not None:
+        return msgspec.to_builtins(_SERP_DECODER.decode(response.content))
+    return json_loads(response.content)
+
+
+def _fetch(url: str) -> Optional[str]:
+    """
+    Fetch a result page for content preview.
+
+    Args:
+        url: Page URL
+
+    Returns:
+        Page HTML, or None if the fetch failed
+    """
+    try:
+        response = _SESSION.get(url, timeout=5)
+        if response.status_code == 200:
+            return response.text
+    except Exception:
+        pass  # Silently skip content fetching on errors
+    return None
+
+
+def _extract_content(html: str) -> str:
+    """
+    Pull the first substantial block of text out of a page.
+
+    Uses selectolax when installed, otherwise BeautifulSoup's html.parser.
+
+    Args:
+        html: Page HTML
+
+    Returns:
+        Up to 500 characters of content, or "" if none was found
+    """
+    try:
+        if HTMLParser is not None:
+            tree = HTMLParser(html)
+            for tag in ['p', 'div', 'section']:
+                for node in tree.css(tag)[:3]:  # First few elements
+                    text = node.text().strip()
+                    if len(text) > 100:  # Prefer longer content
+                        return text[:500]  # Limit to 500 chars
+            return ""
+
+        soup = BeautifulSoup(html, 'html.parser')
+        for tag in ['p', 'div', 'section']:
+            elements = soup.find_all(tag)
+            for elem in elements[:3]:  # First few elements
+                text = elem.get_text().strip()
+                if len(text) > 100:  # Prefer longer content
+                    return text[:500]  # Limit to 500 chars
+    except Exception:
+        pass  # Unparseable pages just get no preview
+    return ""
+
+
+def _fetch_preview(url: str) -> str:
+    """
+    Fetch a result page and extract its content preview (runs on _WEB_POOL).
+
+    Args:
+        url: Page URL
+
+    Returns:
+        Content preview, or "" if the page couldn't be fetched or had none
+    """
+    html = _fetch(url)
+    return _extract_content(html) if html else ""
+
+
+def _web_cache_path(query: str, num_results: int) -> Path:
+    """Location of the cached web_search output for a query."""
+    key = hashlib.sha256(f"{query}|{num_results}".encode()).hexdigest()
+    return get_workspace_manager().cache_dir / "websearch" / f"{key}.json"
+
+
+def _web_cache_get(path: Path) -> Optional[str]:
+    """Return a cached web_search output if it is younger than _WEB_CACHE_TTL."""
+    try:
+        if time.time() - path.stat().st_mtime >= _WEB_CACHE_TTL:
+            return None
+        return json_loads(_read_bytes(str(path)))["output"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _web_cache_put(path: Path, output: str):
+    """Store a web_search output; written to a temp file and renamed into place."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"output": output}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # The cache is best-effort
+
+
 def web_search(query: str, num_results: int = 3) -> str:
     """
     Search the web using Google with SerpAPI, extracting AI Overview and top results.
@@ -565,12 +1422,15 @@ def web_search(query: str, num_results: int = 3) -> str:
     Returns:
         Formatted search results including AI overview and key findings
     """
+    if not _WEB_OK:
+        return f"error: Missing dependencies. Install with: uv add requests beautifulsoup4. Error: {_WEB_IMPORT_ERROR}"
+
     try:
-        import os
-        from serpapi import GoogleSearch
-        import requests
-        from bs4 import BeautifulSoup
-        
+        cache_path = _web_cache_path(query, num_results)
+        cached = _web_cache_get(cache_path)
+        if cached is not None:
+            return cached
+
         # Get API key from environment (requires SERPAPI_KEY env var)
         api_key = os.getenv("SERPAPI_KEY")
         if not api_key:
@@ -586,23 +1446,18 @@ def web_search(query: str, num_results: int = 3) -> str:
             "gl": "us"
         }
         
-        # Perform search
-        import signal
-        
-        def timeout_handler(signum, frame):
-            raise TimeoutError("Search timeout")
-        
-        signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(15)  # 15 second timeout
-        
+        # Perform search on a worker thread so the deadline works from any thread
+        future = _WEB_POOL.submit(_serpapi_search, params)
         try:
-            search = GoogleSearch(params)
-            results = search.get_dict()
-            signal.alarm(0)  # Cancel alarm
-        except TimeoutError:
-            signal.alarm(0)
+            results = future.result(timeout=15)
+        except (TimeoutError, requests.Timeout):
+            # Drop the request if it is still queued behind busy workers
+            future.cancel()
             return "error: Search request timed out"
         
+        if results.get("error"):
+            return f"error: {results['error']}"
+        
         # Extract organic results
         organic_results = results.get("organic_results", [])
         
@@ -626,43 +1481,30 @@ def web_search(query: str, num_results: int = 3) -> str:
         # Process top results
         output_parts.append(f"🔍 TOP {min(num_results, len(organic_results))} RESULTS:\n")
         
-        for i, result in enumerate(organic_results[:num_results], 1):
-            title = result.get("title", "No title")
-            snippet = result.get("snippet", "No snippet")
-            link = result.get("link", "")
+        # Fetch and parse the result pages concurrently, so one page is parsed
+        # while the others are still downloading
+        top_results = organic_results[:num_results]
+        previews = list(_WEB_POOL.map(_fetch_preview, [r.get("link") or "" for r in top_results]))
+
+        for i, (result, content) in enumerate(zip(top_results, previews), 1):
+            title = result.get("title") or "No title"
+            snippet = result.get("snippet") or "No snippet"
+            link = result.get("link") or ""
             
             output_parts.append(f"{i}. {title}")
             output_parts.append(f"{snippet}")
             
-            # Try to fetch content from the link for more detailed analysis
-            try:
-                response = requests.get(link, timeout=5, headers={'User-Agent': 'Mozilla/5.0'})
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    # Extract first paragraph of main content
-                    content = ""
-                    for tag in ['p', 'div', 'section']:
-                        elements = soup.find_all(tag)
-                        for elem in elements[:3]:  # First few elements
-                            text = elem.get_text().strip()
-                            if len(text) > 100:  # Prefer longer content
-                                content = text[:500]  # Limit to 500 chars
-                                break
-                        if content:
-                            break
-                    
-                    if content:
-                        output_parts.append(f"📄 Content Preview: {content[:200]}...")
-            except Exception as content_error:
-                pass  # Silently skip content fetching on errors
+            # Use the fetched page content for more detailed analysis
+            if content:
+                output_parts.append(f"📄 Content Preview: {content[:200]}...")
             
             output_parts.append(f"🔗 Link: {link}")
             output_parts.append("")
         
-        return "\n".join(output_parts)
+        output = "\n".join(output_parts)
+        _web_cache_put(cache_path, output)
+        return output
         
-    except ImportError as e:
-        return f"error: Missing dependencies. Install with: uv add google-search-results requests beautifulsoup4. Error: {str(e)}"
     except Exception as e:
         return f"error: Search failed - {str(e)}"
 
@@ -682,7 +1524,6 @@ def get_demo_workspace(name: str) -> str:
         Absolute path to the demo workspace
     """
     try:
-        from bond.workspace import get_workspace_manager
         workspace = get_workspace_manager()
         demo_path = workspace.create_demo_workspace(name)
         return f"Demo workspace created: {demo_path}\nYou should cd to this directory before creating files."
@@ -700,7 +1541,6 @@ def get_test_workspace(test_type: str = "general") -> str:
         Absolute path to the test workspace
     """
     try:
-        from bond.workspace import get_workspace_manager
         workspace = get_workspace_manager()
         test_path = workspace.create_test_workspace(test_type)
         return f"Test workspace created: {test_path}\nYou should cd to this directory before creating test files."
@@ -715,7 +1555,6 @@ def get_temp_workspace() -> str:
         Absolute path to the temporary workspace
     """
     try:
-        from bond.workspace import get_workspace_manager
         workspace = get_workspace_manager()
         temp_path = workspace.create_temp_session()
         return f"Temporary workspace created: {temp_path}\nThis will be auto-cleaned after 7 days."
@@ -730,7 +1569,6 @@ def list_workspaces() -> str:
         Formatted list of workspaces
     """
     try:
-        from bond.workspace import get_workspace_manager
         workspace = get_workspace_manager()
         
         output = []
@@ -775,7 +1613,6 @@ def cleanup_workspaces(days: int = 7) -> str:
         Cleanup summary
     """
     try:
-        from bond.workspace import get_workspace_manager
         workspace = get_workspace_manager()
         cleaned = workspace.cleanup_old_sessions(days)
         if cleaned:
@@ -4,16 +4,104 @@ Prevents pollution of the Bond project directory by isolating demos, tests, and
 """
 
 import os
+import re
 import shutil
+import string
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 import time
 
 
+def _find_project_root() -> Path:
+    """Find the Bond project root by looking for pyproject.toml"""
+    current = Path(__file__).resolve()
+    for parent in current.parents:
+        if (parent / "pyproject.toml").exists():
+            return parent
+    return Path.cwd()
+
+
+# Resolved once; the package doesn't move while the process runs
+_PROJECT_ROOT = _find_project_root()
+
+
+def _timestamp() -> str:
+    """
+    Timestamp for workspace names, e.g. 20250101_120000_3fa9c1.
+
+    The nanosecond suffix makes it unlikely that two workspaces created in
+    the same second get the same name; _make_unique_dir() handles the rest.
+    """
+    return f"{time.strftime('%Y%m%d_%H%M%S')}_{time.time_ns() & 0xFFFFFF:06x}"
+
+
+def _make_unique_dir(parent: Path, stem: str) -> Path:
+    """
+    Create parent/<stem>_<timestamp>, never reusing an existing directory.
+
+    mkdir() without exist_ok is atomic, so if the name is already taken a
+    new timestamp is drawn and the creation retried.
+    """
+    while True:
+        path = parent / f"{stem}_{_timestamp()}"
+        try:
+            path.mkdir()
+            return path
+        except FileExistsError:
+            continue
+
+
+def _scan(directory: Path, prefix: str = "") -> list[os.DirEntry]:
+    """
+    List a directory's entries whose names start with prefix, sorted by name.
+    Hidden entries are skipped, as glob("*") does.
+
+    DirEntry objects carry the file type from the directory read, so callers
+    can filter on is_dir() without another stat per entry.
+    """
+    with os.scandir(directory) as it:
+        entries = [
+            entry for entry in it
+            if entry.name.startswith(prefix) and not entry.name.startswith(".")
+        ]
+    return sorted(entries, key=lambda entry: entry.name)
+
+
+# Characters kept as-is in workspace names; every other ASCII character becomes "_"
+_SAFE_CHARS = frozenset(string.ascii_letters + string.digits + "._-")
+_XLATE = str.maketrans({chr(i): "_" for i in range(128) if chr(i) not in _SAFE_CHARS})
+_UNSAFE_RE = re.compile(r"[^\w.\-]")
+
+
+def _sanitize(name: str) -> str:
+    """Replace characters that aren't alphanumeric or ._- with underscores"""
+    if name.isascii():
+        return name.translate(_XLATE)
+    # Non-ASCII letters and digits are kept, as str.isalnum() would
+    return _UNSAFE_RE.sub("_", name)
+
+
+def _remove_trees(paths: list[str]):
+    """
+    Delete several directory trees concurrently.
+
+    rmtree is a long run of unlink/rmdir syscalls that release the GIL, so
+    a few workers overlap the filesystem work. The first failure is raised.
+    """
+    if not paths:
+        return
+    with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+        list(executor.map(shutil.rmtree, paths))
+
+
 class WorkspaceManager:
     """
-    Manages isolated workspaces for demos, tests, and temporary files.
+    Manages isolated workspaces for demos, tests, and temporary files,
+    plus a cache directory for tool results.
     Prevents pollution of the Bond project directory.
     """
     
@@ -25,28 +113,38 @@ class WorkspaceManager:
             base_dir: Base directory for workspaces (defaults to .workspace/)
         """
         if base_dir is None:
-            # Find Bond project root (where pyproject.toml is)
-            project_root = self._find_project_root()
-            base_dir = project_root / ".workspace"
+            base_dir = _PROJECT_ROOT / ".workspace"
         
         self.base_dir = Path(base_dir)
-        self.demos_dir = self.base_dir / "demos"
-        self.tests_dir = self.base_dir / "tests"
-        self.temp_dir = self.base_dir / "temp"
         
-        # Create directories if they don't exist
+        # Create the base directory; subdirectories are created on first use
         self.base_dir.mkdir(exist_ok=True)
-        self.demos_dir.mkdir(exist_ok=True)
-        self.tests_dir.mkdir(exist_ok=True)
-        self.temp_dir.mkdir(exist_ok=True)
-    
-    def _find_project_root(self) -> Path:
-        """Find the Bond project root by looking for pyproject.toml"""
-        current = Path(__file__).resolve()
-        for parent in current.parents:
-            if (parent / "pyproject.toml").exists():
-                return parent
-        return Path.cwd()
+    
+    def _subdir(self, name: str) -> Path:
+        """Return a subdirectory of base_dir, creating it if needed"""
+        path = self.base_dir / name
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+    
+    @cached_property
+    def demos_dir(self) -> Path:
+        """Directory holding demo workspaces"""
+        return self._subdir("demos")
+    
+    @cached_property
+    def tests_dir(self) -> Path:
+        """Directory holding test workspaces"""
+        return self._subdir("tests")
+    
+    @cached_property
+    def temp_dir(self) -> Path:
+        """Directory holding temporary sessions"""
+        return self._subdir("temp")
+    
+    @cached_property
+    def cache_dir(self) -> Path:
+        """Directory holding cached tool results"""
+        return self._subdir("cache")
     
     def create_demo_workspace(self, name: str) -> Path:
         """
@@ -58,12 +156,9 @@ class WorkspaceManager:
         Returns:
             Path to the demo workspace
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         # Sanitize name to be filesystem-friendly
-        clean_name = "".join(c if c.isalnum() or c in "._-" else "_" for c in name)
-        demo_name = f"{clean_name}_{timestamp}"
-        demo_path = self.demos_dir / demo_name
-        demo_path.mkdir(exist_ok=True)
+        clean_name = _sanitize(name)
+        demo_path = _make_unique_dir(self.demos_dir, clean_name)
         
         # Create a README to explain what this is
         readme = demo_path / "README.md"
@@ -86,12 +181,8 @@ class WorkspaceManager:
         Returns:
             Path to the test workspace
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        clean_name = "".join(c if c.isalnum() or c in "._-" else "_" for c in test_type)
-        test_name = f"{clean_name}_{timestamp}"
-        test_path = self.tests_dir / test_name
-        test_path.mkdir(exist_ok=True)
-        return test_path
+        clean_name = _sanitize(test_type)
+        return _make_unique_dir(self.tests_dir, clean_name)
     
     def create_temp_session(self) -> Path:
         """
@@ -101,10 +192,7 @@ class WorkspaceManager:
         Returns:
             Path to temporary session directory
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        session_path = self.temp_dir / f"session_{timestamp}"
-        session_path.mkdir(exist_ok=True)
-        return session_path
+        return _make_unique_dir(self.temp_dir, "session")
     
     def cleanup_old_sessions(self, days: int = 7):
         """
@@ -115,26 +203,26 @@ class WorkspaceManager:
         """
         cutoff_time = time.time() - (days * 86400)
         
-        cleaned = []
-        for session_dir in self.temp_dir.glob("session_*"):
-            if session_dir.is_dir():
-                if session_dir.stat().st_mtime < cutoff_time:
-                    shutil.rmtree(session_dir)
-                    cleaned.append(session_dir.name)
+        # DirEntry caches the type, and its stat() is a single lstat
+        expired = [
+            entry for entry in _scan(self.temp_dir, "session_")
+            if entry.is_dir(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_mtime < cutoff_time
+        ]
+        _remove_trees([entry.path for entry in expired])
         
-        return cleaned
+        return [entry.name for entry in expired]
     
     def list_demos(self) -> list[Path]:
         """List all demo workspaces"""
-        return sorted(self.demos_dir.glob("*"))
+        return [Path(entry.path) for entry in _scan(self.demos_dir)]
     
     def list_tests(self) -> list[Path]:
         """List all test workspaces"""
-        return sorted(self.tests_dir.glob("*"))
+        return [Path(entry.path) for entry in _scan(self.tests_dir)]
     
     def list_temp_sessions(self) -> list[Path]:
         """List all temporary sessions"""
-        return sorted(self.temp_dir.glob("session_*"))
+        return [Path(entry.path) for entry in _scan(self.temp_dir, "session_")]
     
     def get_current_workspace(self) -> Optional[Path]:
         """Get the current working directory if it's in a workspace"""
@@ -147,27 +235,27 @@ class WorkspaceManager:
     
     def clean_all_demos(self) -> int:
         """Remove all demo workspaces"""
-        demos = self.list_demos()
-        for demo in demos:
-            if demo.is_dir():
-                shutil.rmtree(demo)
+        demos = _scan(self.demos_dir)
+        _remove_trees([demo.path for demo in demos if demo.is_dir(follow_symlinks=False)])
         return len(demos)
     
     def clean_all_tests(self) -> int:
         """Remove all test workspaces"""
-        tests = self.list_tests()
-        for test in tests:
-            if test.is_dir():
-                shutil.rmtree(test)
+        tests = _scan(self.tests_dir)
+        _remove_trees([test.path for test in tests if test.is_dir(follow_symlinks=False)])
         return len(tests)
 
 
 # Global workspace manager instance
 _workspace_manager = None
+# Tool calls run on several threads; only one of them may create the instance
+_workspace_manager_lock = threading.Lock()
 
 def get_workspace_manager() -> WorkspaceManager:
     """Get or create the global workspace manager"""
     global _workspace_manager
     if _workspace_manager is None:
-        _workspace_manager = WorkspaceManager()
+        with _workspace_manager_lock:
+            if _workspace_manager is None:
+                _workspace_manager = WorkspaceManager()
     return _workspace_manager
@@ -1,67 +1,98 @@
-#!/usr/bin/env python3
-"""Demo of the GitHub CLI tool"""
+"""
+Demo of the GitHub CLI tool.
+
+Run from the repository root with: python -m scripts.demo_gh
+"""
 
 import sys
-sys.path.insert(0, '.')
+from concurrent.futures import ThreadPoolExecutor
+
 from bond import tools
 
-print("=" * 70)
-print("GitHub CLI Tool Demo")
-print("=" * 70)
-print()
-
-print("1. Check gh version")
-print("-" * 70)
-result = tools.gh("--version")
-print(result)
-
-print("2. View current repository")
-print("-" * 70)
-result = tools.gh("repo view")
-print(result[:600] + "..." if len(result) > 600 else result)
-print()
-
-print("3. Check status (assigned issues and PRs)")
-print("-" * 70)
-result = tools.gh("status")
-print(result)
-print()
-
-print("4. List issues in current repo")
-print("-" * 70)
-result = tools.gh("issue list")
-if result.strip():
+# Banner rules, built once
+SEP = "=" * 70
+DASH = "-" * 70
+
+COMMANDS = ["--version", "repo view", "status", "issue list", "pr list", "release list"]
+# Only the start of repo view is shown, so gh is stopped once it has printed that much
+MAX_BYTES = {"repo view": 600}
+
+
+def main():
+    # The queries are independent and read-only, so start them all at once; the
+    # demo then takes about as long as the slowest gh call instead of the sum
+    pool = ThreadPoolExecutor(max_workers=len(COMMANDS))
+    results = {}
+    for command in COMMANDS:
+        kwargs = {"max_bytes": MAX_BYTES[command]} if command in MAX_BYTES else {}
+        results[command] = pool.submit(tools.gh, command, **kwargs)
+    pool.shutdown(wait=False)
+
+    # The report is printed in one go once the queries are in; without line
+    # buffering it goes out in a few large writes instead of one per line
+    sys.stdout.reconfigure(line_buffering=False)
+
+    print(SEP)
+    print("GitHub CLI Tool Demo")
+    print(SEP)
+    print()
+
+    print("1. Check gh version")
+    print(DASH)
+    result = results["--version"].result()
     print(result)
-else:
-    print("No issues found")
-print()
-
-print("5. List pull requests")
-print("-" * 70)
-result = tools.gh("pr list")
-if result.strip():
+
+    print("2. View current repository")
+    print(DASH)
+    result = results["repo view"].result()
     print(result)
-else:
-    print("No pull requests found")
-print()
-
-print("6. List releases")
-print("-" * 70)
-result = tools.gh("release list")
-if result.strip():
+    print()
+
+    print("3. Check status (assigned issues and PRs)")
+    print(DASH)
+    result = results["status"].result()
     print(result)
-else:
-    print("No releases found")
-print()
-
-print("=" * 70)
-print("Demo complete!")
-print("=" * 70)
-print()
-print("Other useful commands to try:")
-print("  • tools.gh('repo list')              - List your repositories")
-print("  • tools.gh('issue view 1')           - View issue #1")
-print("  • tools.gh('pr view 1')              - View PR #1")
-print("  • tools.gh('pr status')              - Check PR status")
-print("  • tools.gh('browse')                 - Open repo in browser")
-print("  • tools.gh('api repos/:owner/:repo') - Use GitHub API directly")
+    print()
+
+    print("4. List issues in current repo")
+    print(DASH)
+    result = results["issue list"].result()
+    if result.strip():
+        print(result)
+    else:
+        print("No issues found")
+    print()
+
+    print("5. List pull requests")
+    print(DASH)
+    result = results["pr list"].result()
+    if result.strip():
+        print(result)
+    else:
+        print("No pull requests found")
+    print()
+
+    print("6. List releases")
+    print(DASH)
+    result = results["release list"].result()
+    if result.strip():
+        print(result)
+    else:
+        print("No releases found")
+    print()
+
+    print(SEP)
+    print("Demo complete!")
+    print(SEP)
+    print()
+    print("Other useful commands to try:")
+    print("  • tools.gh('repo list')              - List your repositories")
+    print("  • tools.gh('issue view 1')           - View issue #1")
+    print("  • tools.gh('pr view 1')              - View PR #1")
+    print("  • tools.gh('pr status')              - Check PR status")
+    print("  • tools.gh('browse')                 - Open repo in browser")
+    print("  • tools.gh('api repos/:owner/:repo') - Use GitHub API directly")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Test the agent's tool prefetching against a scripted response stream"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+from bond.agent import BondAgent
+
+
+def tool_use(block_id, name, **arguments):
+    return SimpleNamespace(type="tool_use", id=block_id, name=name, input=arguments)
+
+
+class FakeStream:
+    """Yields a tool_use block's content_block_stop event per block, then the message"""
+
+    def __init__(self, blocks, fail_after=None):
+        self.blocks = blocks
+        self.fail_after = fail_after
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __iter__(self):
+        for i, block in enumerate(self.blocks):
+            yield SimpleNamespace(type="content_block_stop", content_block=block)
+            if i == self.fail_after:
+                raise ConnectionError("stream dropped")
+
+    def get_final_message(self):
+        return SimpleNamespace(content=self.blocks, stop_reason="tool_use")
+
+
+def make_agent(stream):
+    """An agent with a read-only and a state-changing tool, whose next stream is stream"""
+    agent = BondAgent(cache_enabled=False)
+    agent.client = SimpleNamespace(messages=SimpleNamespace(stream=lambda **kwargs: stream))
+    agent.log = []
+    lock = threading.Lock()
+
+    def record(entry):
+        with lock:
+            agent.log.append(entry)
+        return entry
+
+    schema = {"type": "object", "properties": {"arg": {"type": "string"}}, "required": []}
+    agent.add_tool("read", "Read something", schema, lambda arg="": record(f"read {arg}"),
+                   deterministic=True)
+    agent.add_tool("listing", "List something", schema, lambda arg="": record(f"listing {arg}"))
+    agent.add_tool("write", "Change something", schema, lambda arg="": record(f"write {arg}"),
+                   side_effects=True)
+    return agent
+
+
+def test_prefetch():
+    """Deterministic tools start while streaming; others wait for the full response"""
+
+    print("Testing tool prefetching...\n")
+
+    print("1. Testing only deterministic tools are prefetched...")
+    blocks = [tool_use("1", "read", arg="a"), tool_use("2", "listing"), tool_use("3", "write", arg="x")]
+    agent = make_agent(FakeStream(blocks))
+    response = agent.call([{"role": "user", "content": "hi"}])
+    assert set(agent._prefetched) == {"1"}, f"wrong tools prefetched: {set(agent._prefetched)}"
+    assert "write x" not in agent.log, "a tool with side effects ran before the response was complete"
+    agent.handle_tools(response)
+    assert agent.log.count("read a") == 1, f"prefetched tool ran twice: {agent.log}"
+
+    print("2. Testing calls after a serial tool run in order...")
+    blocks = [tool_use("1", "write", arg="x"), tool_use("2", "read", arg="b"), tool_use("3", "write", arg="y")]
+    agent = make_agent(FakeStream(blocks))
+    response = agent.call([{"role": "user", "content": "hi"}])
+    assert not agent._prefetched, "a call after a serial tool was prefetched"
+    agent.handle_tools(response)
+    assert agent.log == ["write x", "read b", "write y"], f"calls ran out of order: {agent.log}"
+
+    print("3. Testing a stream that fails midway...")
+    blocks = [tool_use("1", "read", arg="a"), tool_use("2", "write", arg="x")]
+    agent = make_agent(FakeStream(blocks, fail_after=0))
+    try:
+        agent.call([{"role": "user", "content": "hi"}])
+    except ConnectionError:
+        pass
+    else:
+        raise AssertionError("stream error was swallowed")
+    assert not agent._prefetched, "prefetched calls kept after a failed stream"
+    assert "write x" not in agent.log, "a tool with side effects ran for a failed stream"
+
+    print("\n✅ Prefetching tested successfully!")
+    return True
+
+
+def test_parallel_batches():
+    """Calls a predicate clears overlap; the rest run alone, in order"""
+
+    print("Testing per-call parallel safety...\n")
+    agent = make_agent(FakeStream([]))
+    spans = {}
+
+    def fetch(arg=""):
+        start = time.monotonic()
+        time.sleep(0.3)
+        spans[arg] = (start, time.monotonic())
+        return arg
+
+    schema = {"type": "object", "properties": {"arg": {"type": "string"}}, "required": []}
+    agent.add_tool("fetch", "Fetch or post something", schema, fetch, side_effects=True,
+                   parallel_safe=lambda arguments: arguments.get("arg", "").startswith("get"))
+
+    def run(*args):
+        spans.clear()
+        uses = [tool_use(str(i), "fetch", arg=arg) for i, arg in enumerate(args)]
+        agent.handle_tools(SimpleNamespace(content=uses, stop_reason="tool_use"))
+
+    print("1. Testing two network-bound reads overlap...")
+    run("get a", "get b")
+    (a_start, a_end), (b_start, b_end) = spans["get a"], spans["get b"]
+    assert b_start < a_end and a_start < b_end, f"reads didn't overlap: {spans}"
+
+    print("2. Testing a serial call waits for the calls around it...")
+    run("get a", "post x", "get b")
+    assert spans["get a"][1] <= spans["post x"][0], f"post started before the read before it ended: {spans}"
+    assert spans["post x"][1] <= spans["get b"][0], f"read started before the post before it ended: {spans}"
+    results = [m["content"] for m in agent.context if m["role"] == "tool"][-3:]
+    assert results == ["get a", "post x", "get b"], f"results out of order: {results}"
+
+    print("3. Testing the CLI's curl and gh classification...")
+    from bond.cli import _curl_read_only, _gh_read_only
+    assert _curl_read_only({"url": "example.com"})
+    assert _curl_read_only({"url": "example.com", "options": "-sL -H Accept:text/plain"})
+    for options in ("-X POST", "-sXPOST", "-d a=1", "--data-binary @f", "-o out", "--output=out", "-O"):
+        assert not _curl_read_only({"url": "example.com", "options": options}), options
+    for command in ("repo view", "issue list --state open", "pr diff 3", "search repos bond", "status"):
+        assert _gh_read_only({"command": command}), command
+    for command in ("api repos/x/y", "browse", "pr merge 3", "repo clone x/y", "pr view 3 --web", ""):
+        assert not _gh_read_only({"command": command}), command
+
+    print("\n✅ Per-call parallel safety tested successfully!")
+    return True
+
+
+def round_of(*ids):
+    """One assistant turn calling a tool per id, followed by the results"""
+    calls = [{"id": i, "type": "function", "function": {"name": "read", "arguments": {}}} for i in ids]
+    return [{"role": "assistant", "tool_calls": calls}] + [
+        {"role": "tool", "tool_call_id": i, "content": f"result {i}"} for i in ids
+    ]
+
+
+def assert_rounds_whole(context):
+    """Every tool_calls message is directly followed by exactly its results"""
+    for i, msg in enumerate(context):
+        if "tool_calls" in msg:
+            ids = [call["id"] for call in msg["tool_calls"]]
+            results = context[i + 1:i + 1 + len(ids)]
+            assert [r.get("role") for r in results] == ["tool"] * len(ids), f"round split at {i}: {context}"
+            assert [r["tool_call_id"] for r in results] == ids, f"results out of place at {i}: {context}"
+        elif msg["role"] == "tool":
+            assert any(
+                "tool_calls" in prev and msg["tool_call_id"] in [c["id"] for c in prev["tool_calls"]]
+                for prev in context[:i]
+            ), f"orphaned tool result {msg['tool_call_id']}"
+
+
+def test_compaction():
+    """Old tool rounds are elided whole, and markers from earlier passes merge"""
+
+    print("Testing context compaction...\n")
+    agent = make_agent(FakeStream([]))
+
+    print("1. Testing a round isn't split at the cutoff...")
+    agent.context = [{"role": "user", "content": "hi"}, *round_of("a", "b", "c"), *round_of("d", "e")]
+    before = list(agent.context)
+    agent._compact_context()
+    assert_rounds_whole(agent.context)
+    # The 4th-from-last result belongs to the first round, so nothing can go
+    assert agent.context == before, f"kept round was changed: {agent.context}"
+
+    print("2. Testing whole rounds are elided...")
+    agent.context += round_of("f") + round_of("g")
+    agent._compact_context()
+    assert_rounds_whole(agent.context)
+    assert agent.context[1]["content"] == "[3 prior tool results elided]", f"wrong marker: {agent.context[1]}"
+    assert [m["tool_call_id"] for m in agent.context if m["role"] == "tool"] == ["d", "e", "f", "g"]
+
+    print("3. Testing markers merge across passes...")
+    agent.context += [{"role": "assistant", "content": "done"}, {"role": "user", "content": "again"}]
+    agent.context += round_of("h", "i") + round_of("j")
+    agent._compact_context()
+    assert_rounds_whole(agent.context)
+    markers = [m for m in agent.context if m.get("elided")]
+    assert [m["elided"] for m in markers] == [6], f"markers not merged: {markers}"
+    assert [m["tool_call_id"] for m in agent.context if m["role"] == "tool"] == ["g", "h", "i", "j"]
+    assert {"role": "assistant", "content": "done"} in agent.context, "text turn was dropped"
+
+    print("4. Testing a context trimmed by the caller...")
+    agent.context = agent.context[-2:]
+    agent._compact_context()  # must not raise
+
+    print("\n✅ Compaction tested successfully!")
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        test_prefetch()
+        test_parallel_batches()
+        test_compaction()
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        exit(1)
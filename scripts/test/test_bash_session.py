@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Test that bash() calls can't change the persistent shell they run in"""
+
+import os
+import tempfile
+import time
+
+from bond import tools
+
+
+def test_bash_session():
+    """cd, exec redirections and set -e stay inside the call that made them"""
+
+    print("Testing the bash session...\n")
+
+    shell_pid = tools.bash("echo $$")
+
+    print("1. Testing cd doesn't leak...")
+    tmp = tempfile.gettempdir()
+    assert tools.bash(f"cd {tmp}; pwd").strip() == os.path.realpath(tmp), "cd failed"
+    result = tools.bash("pwd").strip()
+    assert result == tools.pwd(), f"bash is in {result}, pwd() says {tools.pwd()}"
+
+    print("2. Testing exec redirecting stdout...")
+    with tempfile.NamedTemporaryFile() as f:
+        start = time.monotonic()
+        tools.bash(f"exec 1>{f.name}; echo hidden")
+        assert time.monotonic() - start < 5, "session hung after exec 1>file"
+        assert f.read() == b"hidden\n", "redirected output not written"
+    assert tools.bash("echo visible") == "visible\n", "stdout not restored"
+
+    print("3. Testing set -e and exit...")
+    assert tools.bash("set -e; false; echo unreachable") == "", "set -e didn't stop the command"
+    assert tools.bash("exit 3") == "", "exit produced output"
+    assert tools.bash("false; echo still running") == "still running\n", "set -e leaked"
+
+    print("4. Testing the shell survived...")
+    assert tools.bash("echo $$") == shell_pid, "the shell was restarted"
+
+    print("\n✅ Bash session tested successfully!")
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        test_bash_session()
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        exit(1)
@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """Test the new bash tools to ensure they work properly"""
 
+import os
+import tempfile
+from pathlib import Path
+
 from bond import tools
 
 def test_tools():
@@ -32,30 +36,54 @@ def test_tools():
     print(f"   Result: {result}")
     # which may not find python, that's ok
     
+    # A binary installed after a failed lookup is found, and one removed
+    # after being cached is looked up again
+    print("4b. Testing which() after installing and removing a binary...")
+    with tempfile.TemporaryDirectory() as bin_dir:
+        old_path = os.environ["PATH"]
+        os.environ["PATH"] = f"{bin_dir}{os.pathsep}{old_path}"
+        try:
+            assert tools.which("bond-test-bin").startswith("command not found"), "found a missing binary"
+            binary = Path(bin_dir) / "bond-test-bin"
+            binary.write_text("#!/bin/sh\necho installed\n")
+            binary.chmod(0o755)
+            assert tools.which("bond-test-bin") == str(binary), "new binary not found"
+            binary.unlink()
+            assert tools.which("bond-test-bin").startswith("command not found"), "removed binary still found"
+        finally:
+            os.environ["PATH"] = old_path
+    
     # Test uname
     print("5. Testing uname()...")
     result = tools.uname()
     print(f"   Result: {result[:80]}...")
     assert not result.startswith("error"), f"uname failed: {result}"
     
+    # Read this script once; cat, head and wc are checked against it
+    source = Path(__file__).read_bytes()
+    text = source.decode()
+    
     # Test cat on this file
     print("6. Testing cat() on this script...")
     result = tools.cat(__file__)
     print(f"   Result: {len(result)} characters")
     assert not result.startswith("error"), f"cat failed: {result}"
-    assert "test_tools" in result, "cat didn't return file content"
+    assert result == text, "cat didn't return file content"
     
     # Test head
     print("7. Testing head() on this script...")
     result = tools.head(__file__, lines=5)
     print(f"   Result: {len(result)} characters")
     assert not result.startswith("error"), f"head failed: {result}"
+    assert result == "".join(text.splitlines(keepends=True)[:5]), "head didn't return the first 5 lines"
     
     # Test wc
     print("8. Testing wc() on this script...")
     result = tools.wc(__file__)
     print(f"   Result: {result.strip()}")
     assert not result.startswith("error"), f"wc failed: {result}"
+    counts = [text.count("\n"), len(source.split()), len(source)]
+    assert result.split()[:3] == [str(count) for count in counts], f"wc miscounted: {result}"
     
     # Test find
     print("9. Testing find()...")
@@ -69,20 +97,50 @@ def test_tools():
     print(f"   Result: {result.strip()}")
     assert result.strip() == "hello", f"bash failed: {result}"
     
+    # Cross-check the in-process tools against their shell commands, run
+    # together in one round trip through the persistent bash session
+    print("11. Cross-checking in-process tools against batch()...")
+    with tempfile.NamedTemporaryFile(suffix=".txt") as crlf:
+        crlf.write(b"a\r\nb\rc\r\nd\r\ne")
+        crlf.flush()
+        checks = {
+            "pwd": tools.pwd() + "\n",
+            "whoami": tools.whoami() + "\n",
+            "uname -snrvm": tools.uname() + "\n",
+            f"head -n 5 {__file__}": tools.head(__file__, lines=5),
+            f"head -n -3 {__file__}": tools.head(__file__, lines=-3),
+            f"head -n 2 {crlf.name}": tools.head(crlf.name, lines=2),
+            f"head -n -1 {crlf.name}": tools.head(crlf.name, lines=-1),
+            f"wc {__file__}": tools.wc(__file__),
+            "find bond -name '*.py'": tools.find("bond", "*.py"),
+        }
+        for (command, expected), actual in zip(checks.items(), tools.batch(list(checks))):
+            assert actual == expected, f"{command}: shell gave {actual!r}, tool gave {expected!r}"
+    print(f"   Result: {len(checks)} tools match")
+    
     # Test tree
-    print("11. Testing tree() with level=1...")
+    print("12. Testing tree() with level=1...")
     result = tools.tree(".", level=1, options="-d")
     print(f"   Result: {len(result.splitlines())} lines")
     assert not result.startswith("error"), f"tree failed: {result}"
     assert "directories" in result or "directory" in result, "tree didn't produce directory count"
     
     # Test gh (GitHub CLI)
-    print("12. Testing gh() with --version...")
+    print("13. Testing gh() with --version...")
     result = tools.gh("--version")
     print(f"   Result: {result.splitlines()[0] if result else 'empty'}")
     assert not result.startswith("error"), f"gh failed: {result}"
     assert "gh version" in result, "gh didn't return version info"
     
+    # Spawned commands get SIGPIPE back, so a closed pipe ends them quietly
+    print("14. Testing a pipeline cut short by head...")
+    @tools.shellout(timeout=10)
+    def yes_head():
+        return ["sh", "-c", "yes | head -n 2"]
+    result = yes_head()
+    print(f"   Result: {result!r}")
+    assert result == "y\ny\n", f"pipeline failed: {result}"
+    
     print("\n✅ All tools tested successfully!")
     return True
 
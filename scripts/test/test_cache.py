@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Test the LLM response cache"""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from bond.cache import LLMCache, SQLiteBackend
+
+
+def test_cache():
+    """Exercise hit/miss accounting, LRU eviction and TTL expiry"""
+
+    print("Testing LLMCache...\n")
+
+    print("1. Testing miss then hit...")
+    cache = LLMCache(max_size=2)
+    assert cache.get("a") is None, "empty cache returned a value"
+    cache.set("a", 1)
+    assert cache.get("a") == 1, "stored value not returned"
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1, f"bad stats: {cache.stats}"
+
+    print("2. Testing LRU eviction...")
+    cache.set("b", 2)
+    cache.get("a")  # 'a' is now most recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None, "least recently used entry was not evicted"
+    assert cache.get("a") == 1 and cache.get("c") == 3, "wrong entry evicted"
+    assert cache.stats["evictions"] == 1, f"bad stats: {cache.stats}"
+
+    print("3. Testing TTL expiry...")
+    cache = LLMCache(ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None, "expired entry was returned"
+    assert len(cache) == 0, "expired entry was not dropped"
+
+    print("\n✅ Cache tested successfully!")
+    return True
+
+
+def test_sqlite_backend():
+    """Entries written through SQLiteBackend survive reopening the database"""
+
+    print("Testing SQLiteBackend...\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cache.sqlite"
+
+        print("1. Testing round-trip across connections...")
+        cache = LLMCache(backend=SQLiteBackend(path))
+        cache.set("a", {"content": [1, 2, 3]})
+        reopened = LLMCache(backend=SQLiteBackend(path))
+        assert reopened.get("a") == {"content": [1, 2, 3]}, "value not persisted"
+        assert len(reopened) == 1, "wrong entry count"
+
+        print("2. Testing concurrent sessions...")
+        # Both stay open, as two running bond processes would
+        cache.set("b", 2)
+        assert reopened.get("b") == 2, "write not visible to the other session"
+        reopened.set("c", 3)
+        assert cache.get("c") == 3, "second session could not write"
+
+        print("3. Testing a failing backend write...")
+        class LockedBackend(SQLiteBackend):
+            def set(self, key, value, ttl):
+                raise sqlite3.OperationalError("database is locked")
+        locked = LLMCache(backend=LockedBackend(path))
+        locked.set("d", 4)  # must not raise
+        assert locked.get("d") is None, "failed write was reported as stored"
+
+        print("4. Testing clear...")
+        reopened.clear()
+        assert reopened.get("a") is None, "clear left entries behind"
+
+        print("5. Testing TTL expiry...")
+        expiring = LLMCache(ttl=0, backend=SQLiteBackend(path))
+        expiring.set("b", 1)
+        assert expiring.get("b") is None, "expired entry was returned"
+
+    print("\n✅ SQLiteBackend tested successfully!")
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        test_cache()
+        test_sqlite_backend()
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        exit(1)
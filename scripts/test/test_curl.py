@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Test curl() against a local HTTP server, with and without a URL scheme"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bond import tools
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Serves /hello, and /old as a redirect to it"""
+
+    def do_GET(self):
+        self._respond(body=True)
+
+    def do_HEAD(self):
+        self._respond(body=False)
+
+    def _respond(self, body):
+        if self.path == "/old":
+            self.send_response(301)
+            self.send_header("Location", "/hello")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", "5")
+        self.end_headers()
+        if body:
+            self.wfile.write(b"hello")
+
+    def log_message(self, *args):
+        pass
+
+
+def test_curl():
+    """Run curl's -I and -L paths on URLs with and without http://"""
+
+    print("Testing curl...\n")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f"127.0.0.1:{server.server_port}"
+    try:
+        for prefix in ("http://", ""):
+            print(f"1. Testing -L with {prefix or 'no scheme'}...")
+            result = tools.curl(f"{prefix}{host}/old", "-L")
+            assert result == "hello", f"curl -L failed: {result}"
+
+            print(f"2. Testing -I with {prefix or 'no scheme'}...")
+            result = tools.curl(f"{prefix}{host}/hello", "-I")
+            assert not result.startswith("error"), f"curl -I failed: {result}"
+            assert " 200 " in result.splitlines()[0], f"curl -I gave no status line: {result}"
+    finally:
+        server.shutdown()
+
+    print("\n✅ curl tested successfully!")
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        test_curl()
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        exit(1)
@@ -4,23 +4,30 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+# Banner rules, built once
+SEP = "=" * 70
+
 # Load .env
 env_path = Path(__file__).parent / '.env'
 load_dotenv(env_path)
 
-print("=" * 70)
+# Every variable this script reads, looked up once after .env is loaded
+ENV_KEYS = (
+    'BOND_AUTH_TOKEN', 'BOND_BASE_URL', 'BOND_MODEL',
+    'ANTHROPIC_AUTH_TOKEN', 'ANTHROPIC_BASE_URL', 'ANTHROPIC_MODEL',
+)
+env_vars = {key: os.getenv(key) for key in ENV_KEYS}
+
+print(SEP)
 print("Testing API Access Methods")
-print("=" * 70)
+print(SEP)
 
 # Test 1: Using zai-sdk with Anthropic endpoint
 print("\n--- Test 1: zai-sdk with Anthropic endpoint ---")
 try:
-    from zai import ZaiClient
+    from bond.testing import get_shared_client
 
-    client = ZaiClient(
-        api_key=os.getenv('BOND_AUTH_TOKEN'),
-        base_url=os.getenv('BOND_BASE_URL')
-    )
+    client = get_shared_client(env_vars['BOND_BASE_URL'], env_vars['BOND_AUTH_TOKEN'])
 
     response = client.chat.completions.create(
         model='GLM-4.6',
@@ -45,8 +52,8 @@ try:
 
     # Try with Anthropic client
     client = Anthropic(
-        api_key=os.getenv('BOND_AUTH_TOKEN'),
-        base_url=os.getenv('BOND_BASE_URL')
+        api_key=env_vars['BOND_AUTH_TOKEN'],
+        base_url=env_vars['BOND_BASE_URL']
     )
 
     # Note: This might not work as anthropic has its own API structure
@@ -60,15 +67,15 @@ except Exception as e:
 
 # Test 3: Check what environment variables zai-sdk actually uses
 print("\n--- Test 3: Environment variable check ---")
-print(f"BOND_AUTH_TOKEN: {os.getenv('BOND_AUTH_TOKEN', 'NOT SET')[:20]}...")
-print(f"BOND_BASE_URL: {os.getenv('BOND_BASE_URL', 'NOT SET')}")
-print(f"BOND_MODEL: {os.getenv('BOND_MODEL', 'NOT SET')}")
+print(f"BOND_AUTH_TOKEN: {(env_vars['BOND_AUTH_TOKEN'] or 'NOT SET')[:20]}...")
+print(f"BOND_BASE_URL: {env_vars['BOND_BASE_URL'] or 'NOT SET'}")
+print(f"BOND_MODEL: {env_vars['BOND_MODEL'] or 'NOT SET'}")
 
 # Test if ANTHROPIC_* variables would work better
-print(f"\nANTHROPIC_AUTH_TOKEN: {os.getenv('ANTHROPIC_AUTH_TOKEN', 'NOT SET')}")
-print(f"ANTHROPIC_BASE_URL: {os.getenv('ANTHROPIC_BASE_URL', 'NOT SET')}")
-print(f"ANTHROPIC_MODEL: {os.getenv('ANTHROPIC_MODEL', 'NOT SET')}")
+print(f"\nANTHROPIC_AUTH_TOKEN: {env_vars['ANTHROPIC_AUTH_TOKEN'] or 'NOT SET'}")
+print(f"ANTHROPIC_BASE_URL: {env_vars['ANTHROPIC_BASE_URL'] or 'NOT SET'}")
+print(f"ANTHROPIC_MODEL: {env_vars['ANTHROPIC_MODEL'] or 'NOT SET'}")
 
-print("\n" + "=" * 70)
+print("\n" + SEP)
 print("Testing Complete")
-print("=" * 70)
+print(SEP)
@@ -1,11 +1,26 @@
 """Test the Anthropic endpoint with the actual working token from environment."""
 
 import os
-from zai import ZaiClient
 
-print("=" * 70)
+from bond.testing import get_shared_client
+from bond.testing.error_hints import diagnose
+
+# Banner rules, built once
+SEP = "=" * 70
+
+# What to tell the user about each kind of failure, most important first
+HINTS = {
+    'balance': "\n💡 This is a credit-based error.\n"
+               "   Code plan should not use credits - this might be expected for this endpoint.",
+    'unknown_model': "\n💡 Model not found. The model name might be different.",
+    'not_found': "\n💡 Endpoint not found. The Anthropic endpoint might need different approach.",
+    'params': "\n💡 Parameter error. The Anthropic endpoint might require anthropic package.",
+}
+
+
+print(SEP)
 print("Testing Anthropic Endpoint with Working Claude Code Token")
-print("=" * 70)
+print(SEP)
 
 # Try different token sources
 auth_token = os.getenv('ANTHROPIC_AUTH_TOKEN') or os.getenv('BOND_AUTH_TOKEN')
@@ -22,11 +37,8 @@ if not auth_token:
     exit(1)
 
 try:
-    # Create client
-    client = ZaiClient(
-        api_key=auth_token,
-        base_url=base_url
-    )
+    # Create client (both probes share its httpx connection pool)
+    client = get_shared_client(base_url, auth_token)
 
     print("Calling API...")
     response = client.chat.completions.create(
@@ -46,22 +58,16 @@ except Exception as e:
     print(f"\n❌ FAILED: {error_msg}")
 
     # Parse the error
-    if '1113' in error_msg or 'Insufficient balance' in error_msg:
-        print("\n💡 This is a credit-based error.")
-        print("   Code plan should not use credits - this might be expected for this endpoint.")
-    elif '1211' in error_msg or 'Unknown Model' in error_msg:
-        print("\n💡 Model not found. The model name might be different.")
-    elif '404' in error_msg or 'NOT_FOUND' in error_msg:
-        print("\n💡 Endpoint not found. The Anthropic endpoint might need different approach.")
-    elif '2003' in error_msg or '2013' in error_msg:
-        print("\n💡 Parameter error. The Anthropic endpoint might require anthropic package.")
-
-print("\n" + "=" * 70)
+    hint = diagnose(error_msg, HINTS)
+    if hint:
+        print(hint)
+
+print("\n" + SEP)
 
 # Also test if we should use the MiniMax endpoint
-print("\n" + "=" * 70)
+print("\n" + SEP)
 print("Testing with MiniMax Endpoint (from environment)")
-print("=" * 70)
+print(SEP)
 
 minimax_base = 'https://api.minimax.io/anthropic'
 minimax_model = 'MiniMax-M2'
@@ -70,10 +76,7 @@ print(f"Base URL: {minimax_base}")
 print(f"Model: {minimax_model}")
 
 try:
-    client = ZaiClient(
-        api_key=auth_token,
-        base_url=minimax_base
-    )
+    client = get_shared_client(minimax_base, auth_token)
 
     response = client.chat.completions.create(
         model=minimax_model,
@@ -88,5 +91,5 @@ try:
 except Exception as e:
     print(f"\n❌ MiniMax also failed: {str(e)}")
 
-print("\n" + "=" * 70)
+print("\n" + SEP)
 
@@ -1,24 +1,27 @@
 """Direct test using values from .env file."""
 
-from zai import ZaiClient
+import os
+import traceback
+
 from bond.config import load_config
+from bond.testing import get_shared_client
+
+# Banner rules, built once
+SEP = "=" * 70
 
 # Load config from .env
 config = load_config()
 
-print("=" * 70)
+print(SEP)
 print("Direct Test Using .env Values")
-print("=" * 70)
+print(SEP)
 print(f"Base URL: {config['base_url']}")
 print(f"Model: {config['model']}")
 print(f"Auth Token: {config['auth_token'][:30] if config['auth_token'] else 'NOT FOUND'}...")
 print()
 
 try:
-    client = ZaiClient(
-        api_key=config['auth_token'],
-        base_url=config['base_url']
-    )
+    client = get_shared_client(config['base_url'], config['auth_token'])
 
     response = client.chat.completions.create(
         model=config['model'],
@@ -34,8 +37,9 @@ try:
         print(f"Response: {response}")
 
 except Exception as e:
-    print(f"❌ FAILED: {str(e)}")
-    import traceback
-    traceback.print_exc()
+    # Just the exception line; the full stack is only walked on request
+    print(f"❌ FAILED: {''.join(traceback.format_exception_only(e)).strip()}")
+    if os.getenv('BOND_TEST_VERBOSE'):
+        traceback.print_exc()
 
-print("=" * 70)
+print(SEP)
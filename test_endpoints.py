@@ -1,12 +1,29 @@
 """Test different API endpoints for code plan subscription."""
 
-from zai import ZaiClient
+import asyncio
+import sys
+from urllib.parse import urlparse
+
+import httpx
 from bond.config import load_config
+from bond.testing.error_hints import classify, error_kinds
 import json
 
+try:
+    import h2  # noqa: F401  Optional: lets the pooled connections multiplex probes
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+# Banner rules, built once
+SEP = "=" * 70
+
 # Load config
 config = load_config()
 
+# Which category wins when a message carries markers of several
+ERROR_PRIORITY = ['not_found', 'auth', 'balance', 'unknown_model']
+
 # Different endpoints to test
 endpoints_to_test = [
     ('https://api.z.ai/api/paas/v4/', 'Standard PaaS v4'),
@@ -17,6 +34,11 @@ endpoints_to_test = [
     ('https://open.bigmodel.cn/api/paas/v3/', 'Legacy BigModel v3'),
 ]
 
+# Hosts on which a probe came back "insufficient balance", mapped to that
+# endpoint's URL: the token is accepted there, so the host's other endpoints
+# have nothing left to tell us
+auth_confirmed_hosts = {}
+
 # Different models to test
 models_to_test = [
     'glm-4-plus',
@@ -33,89 +55,210 @@ models_to_test = [
     'GLM-4-flash',
 ]
 
-print("=" * 70)
+# Buffer stdout and flush once per endpoint report instead of on every line
+sys.stdout.reconfigure(line_buffering=False)
+
+print(SEP)
 print("Testing API Endpoints with Code Plan Subscription")
-print("=" * 70)
+print(SEP)
 print(f"Auth Token: {config['auth_token'][:20]}...")
 print()
 
-# Test each endpoint
-for base_url, description in endpoints_to_test:
-    print(f"\n{'=' * 70}")
-    print(f"Testing: {description}")
-    print(f"Base URL: {base_url}")
-    print(f"{'=' * 70}")
 
+class ProbeError(Exception):
+    """A probe request that came back with an error status."""
+
+    def __init__(self, status_code, body):
+        super().__init__(f"Error code: {status_code} - {body}")
+        self.body = body
+
+
+async def probe(client, base_url, model):
+    """
+    Send one chat completion request, the same call ZaiClient would make.
+
+    Returns:
+        The decoded response body
+    """
+    response = await client.post(
+        base_url.rstrip('/') + '/chat/completions',
+        json={
+            "model": model,
+            "messages": [{"role": "user", "content": "Say 'test'"}],
+            "max_tokens": 5,
+        },
+    )
+    if response.is_error:
+        raise ProbeError(response.status_code, response.text)
+    return response.json()
+
+
+async def settled(coro):
+    """
+    Await coro, returning its exception instead of raising it.
+
+    Probes are started as tasks and some are abandoned once an answer is in;
+    this keeps their failures from being reported as never retrieved.
+    """
     try:
-        client = ZaiClient(
-            api_key=config['auth_token'],
-            base_url=base_url
-        )
+        return await coro
+    except Exception as e:
+        return e
+
+
+def host(base_url):
+    """The host:port part of base_url."""
+    return urlparse(base_url).netloc
+
+
+def prune_confirmed_host(attempts):
+    """
+    Build a done-callback that records auth-confirmed hosts.
+
+    When an endpoint's probe comes back "insufficient balance", the probes
+    still running against other endpoints on the same host are cancelled.
+    """
+    def on_done(attempt):
+        result = None if attempt.cancelled() else attempt.result()
+        if not isinstance(result, Exception) or classify(str(result), ERROR_PRIORITY) != 'balance':
+            return
+        base_url = attempts[attempt]
+        auth_confirmed_hosts.setdefault(host(base_url), base_url)
+        for other, other_url in attempts.items():
+            if other is not attempt and host(other_url) == host(base_url):
+                other.cancel()
+    return on_done
 
-        # Try a simple API call
-        response = client.chat.completions.create(
-            model=models_to_test[0],
-            messages=[{"role": "user", "content": "Say 'test'"}],
-            max_tokens=5
+
+def content(response):
+    """Text of the first choice, or None if the response has no choices."""
+    choices = response.get('choices')
+    return choices[0]['message']['content'] if choices else None
+
+
+async def first_working_model(client, base_url, models):
+    """
+    Try the models concurrently and keep the first working one in list order.
+
+    Results are read in the order of models, so the report is the same as
+    trying them one by one; the models after the winner aren't waited for.
+
+    Returns:
+        (model, response) for the winner, or None if every model failed
+    """
+    probes = [
+        asyncio.create_task(settled(probe(client, base_url, model)))
+        for model in models
+    ]
+    try:
+        for model, task in zip(models, probes):
+            result = await task
+            if not isinstance(result, Exception):
+                return model, result
+            if 'unknown_model' not in error_kinds(str(result)):
+                print(f"   Trying {model}: {result}")
+        return None
+    finally:
+        for task in probes:
+            task.cancel()
+
+
+async def main():
+    # One pooled client for every probe, so endpoints on the same host
+    # (four of them are on api.z.ai) reuse its connections
+    async with httpx.AsyncClient(
+        http2=HTTP2,
+        timeout=30,
+        headers={"Authorization": f"Bearer {config['auth_token']}"},
+        limits=httpx.Limits(max_keepalive_connections=20),
+    ) as client:
+        # Probe every endpoint at once, then report on them in order
+        attempts = [
+            asyncio.create_task(settled(probe(client, base_url, models_to_test[0])))
+            for base_url, _ in endpoints_to_test
+        ]
+        on_done = prune_confirmed_host(
+            {attempt: base_url for attempt, (base_url, _) in zip(attempts, endpoints_to_test)}
         )
+        for attempt in attempts:
+            attempt.add_done_callback(on_done)
+        try:
+            await report(client, attempts)
+        finally:
+            # The remaining endpoints' answers aren't needed
+            for attempt in attempts:
+                attempt.cancel()
 
-        print(f"✅ SUCCESS! Response received")
-        if response.choices:
-            print(f"Content: {response.choices[0].message.content}")
-        else:
-            print(f"Full response: {response}")
-        break
 
-    except Exception as e:
-        error_msg = str(e)
-        print(f"❌ FAILED: {error_msg}")
-
-        # Parse error to see if it's an auth issue or endpoint issue
-        if '404' in error_msg or 'NOT_FOUND' in error_msg:
-            print(f"   → Endpoint not found")
-        elif '401' in error_msg or '403' in error_msg or 'Unauthorized' in error_msg:
-            print(f"   → Authentication failed")
-        elif 'Insufficient balance' in error_msg:
-            print(f"   → Endpoint valid but insufficient balance (this is OK!)")
+async def report(client, attempts):
+    # Test each endpoint
+    for (base_url, description), attempt in zip(endpoints_to_test, attempts):
+        print(f"\n{SEP}")
+        print(f"Testing: {description}")
+        print(f"Base URL: {base_url}")
+        print(SEP, flush=True)
+
+        await asyncio.wait({attempt})
+        confirmed_by = auth_confirmed_hosts.get(host(base_url))
+        if attempt.cancelled() and confirmed_by:
+            print(f"⏭️  SKIPPED: auth already confirmed on this host by {confirmed_by}")
+            continue
+
+        try:
+            response = attempt.result()
+            if isinstance(response, Exception):
+                raise response
+
+            print(f"✅ SUCCESS! Response received")
+            if content(response) is not None:
+                print(f"Content: {content(response)}")
+            else:
+                print(f"Full response: {response}")
             break
-        elif 'Unknown Model' in error_msg or '1211' in error_msg:
-            print(f"   → Endpoint valid, wrong model. Trying other models...")
-            # Try other models
-            found_working_model = None
-            for model in models_to_test[1:]:
-                try:
-                    response = client.chat.completions.create(
-                        model=model,
-                        messages=[{"role": "user", "content": "Say 'test'"}],
-                        max_tokens=5
-                    )
-                    print(f"   ✅ Found working model: {model}")
-                    if response.choices:
-                        print(f"   Content: {response.choices[0].message.content}")
-                        found_working_model = model
+
+        except Exception as e:
+            error_msg = str(e)
+            print(f"❌ FAILED: {error_msg}")
+
+            # Parse error to see if it's an auth issue or endpoint issue
+            kind = classify(error_msg, ERROR_PRIORITY)
+            if kind == 'not_found':
+                print(f"   → Endpoint not found")
+            elif kind == 'auth':
+                print(f"   → Authentication failed")
+            elif kind == 'balance':
+                print(f"   → Endpoint valid but insufficient balance (this is OK!)")
+                break
+            elif kind == 'unknown_model':
+                print(f"   → Endpoint valid, wrong model. Trying other models...", flush=True)
+                found_working_model = None
+                working = await first_working_model(client, base_url, models_to_test[1:])
+                if working:
+                    found_working_model, response = working
+                    print(f"   ✅ Found working model: {found_working_model}")
+                    if content(response) is not None:
+                        print(f"   Content: {content(response)}")
                     else:
                         print(f"   Full response: {response}")
-                        found_working_model = model
+                if found_working_model:
+                    print(f"\n🎉 SUCCESS! Working configuration:")
+                    print(f"   Base URL: {base_url}")
+                    print(f"   Model: {found_working_model}")
                     break
-                except Exception as model_error:
-                    if '1211' not in str(model_error) and 'Unknown Model' not in str(model_error):
-                        print(f"   Trying {model}: {model_error}")
-            if found_working_model:
-                print(f"\n🎉 SUCCESS! Working configuration:")
-                print(f"   Base URL: {base_url}")
-                print(f"   Model: {found_working_model}")
-                break
-        else:
-            # Extract error code if present
-            if 'code' in error_msg:
-                try:
-                    error_json = json.loads(error_msg)
-                    if 'code' in error_json:
-                        print(f"   → Error code: {error_json['code']}")
-                        print(f"   → Error message: {error_json.get('message', 'N/A')}")
-                except:
-                    pass
-
-print(f"\n{'=' * 70}")
+            else:
+                # Extract error code if present
+                if 'code' in error_msg:
+                    try:
+                        error_json = json.loads(getattr(e, 'body', error_msg))
+                        if 'code' in error_json:
+                            print(f"   → Error code: {error_json['code']}")
+                            print(f"   → Error message: {error_json.get('message', 'N/A')}")
+                    except:
+                        pass
+
+
+asyncio.run(main())
+
+print(f"\n{SEP}")
 print("Testing Complete")
-print(f"{'=' * 70}")
+print(SEP)
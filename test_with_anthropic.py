@@ -1,14 +1,20 @@
 """Test using the anthropic package instead of zai-sdk."""
 
+import os
+import traceback
+
 from anthropic import Anthropic
 from bond.config import load_config
 
+# Banner rules, built once
+SEP = "=" * 70
+
 # Load config from .env
 config = load_config()
 
-print("=" * 70)
+print(SEP)
 print("Testing with Anthropic Python Package")
-print("=" * 70)
+print(SEP)
 print(f"Base URL: {config['base_url']}")
 print(f"Model: {config['model']}")
 print(f"Auth Token: {config['auth_token'][:30] if config['auth_token'] else 'NOT FOUND'}...")
@@ -41,11 +47,12 @@ except TypeError as e:
     else:
         raise
 except Exception as e:
-    print(f"❌ FAILED: {str(e)}")
-    import traceback
-    traceback.print_exc()
+    # Just the exception line; the full stack is only walked on request
+    print(f"❌ FAILED: {''.join(traceback.format_exception_only(e)).strip()}")
+    if os.getenv('BOND_TEST_VERBOSE'):
+        traceback.print_exc()
 
-print("\n" + "=" * 70)
+print("\n" + SEP)
 print("Note: The anthropic package is designed for Anthropic's API,")
 print("not for z.ai's Anthropic-compatible endpoint.")
-print("=" * 70)
+print(SEP)
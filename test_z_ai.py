@@ -1,16 +1,24 @@
 #!/usr/bin/env python3
 """Test script to verify z.ai Anthropic endpoint with tool calling"""
 
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+
 from bond.agent import BondAgent
-from bond.tools import register_tools
+from bond.cli import setup_agent
 
 def test_z_ai():
     """Test a simple interaction with the z.ai endpoint"""
     print("Initializing Bond agent...")
-    agent = BondAgent()
+    # BondAgent() spends its time importing anthropic and setup_agent() its
+    # time importing bond.tools; load the two side by side
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        agent_future = pool.submit(BondAgent)
+        pool.submit(importlib.import_module, "bond.tools").result()
+        agent = agent_future.result()
     
     # Register tools
-    register_tools(agent)
+    setup_agent(agent)
     
     print(f"Registered {len(agent.tools)} tools")
     print("Tool format sample:", list(agent.tools.values())[0] if agent.tools else "No tools")